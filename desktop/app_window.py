@@ -0,0 +1,80 @@
+"""
+Embedded app window for the Todo App launcher
+Keeps a warm QtWebEngine view with a persistent profile so opening the app does not start a browser
+"""
+import os
+
+from PySide6.QtCore import QUrl
+from PySide6.QtGui import QIcon
+from PySide6.QtWidgets import QApplication, QMainWindow
+
+try:
+    from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
+    from PySide6.QtWebEngineWidgets import QWebEngineView
+    WEB_ENGINE_AVAILABLE = True
+except ImportError:
+    WEB_ENGINE_AVAILABLE = False
+
+
+class AppWindow(QMainWindow):
+    """Window showing the app in an embedded web view that stays loaded while hidden"""
+
+    def __init__(self, data_dir, cache_size_mb=256, icon=None):
+        super().__init__()
+        self.setWindowTitle("Personal Todo App")
+        self.resize(1280, 860)
+        if icon is not None:
+            self.setWindowIcon(icon if isinstance(icon, QIcon) else QIcon(icon))
+
+        # Named profile: cookies, local storage, service workers and the HTTP cache survive restarts
+        self.profile = QWebEngineProfile("TodoApp", QApplication.instance())
+        self.profile.setPersistentStoragePath(os.path.join(data_dir, "web_profile"))
+        self.profile.setCachePath(os.path.join(data_dir, "web_cache"))
+        self.profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+        self.profile.setHttpCacheMaximumSize(cache_size_mb * 1024 * 1024)
+        self.profile.setPersistentCookiesPolicy(QWebEngineProfile.ForcePersistentCookies)
+
+        self.view = QWebEngineView(self)
+        self.page = QWebEnginePage(self.profile, self.view)
+        self.view.setPage(self.page)
+        self.setCentralWidget(self.view)
+
+        self.loaded_url = None
+        self.loaded = False
+        self.loading = False
+        self.show_when_ready = False
+        self.page.loadFinished.connect(self.on_load_finished)
+
+    def preload(self, url, show_when_ready=False):
+        """Load the app in the background, optionally showing the window once it is ready"""
+        self.show_when_ready = show_when_ready
+        self.loaded = False
+        self.loading = True
+        self.loaded_url = url
+        self.view.load(QUrl(url))
+
+    def show_app(self, url):
+        """Show the window, loading the app first only if it is not already loaded"""
+        if self.loading and self.loaded_url == url:
+            self.show_when_ready = True
+        elif self.loaded and self.loaded_url == url:
+            self.bring_to_front()
+        else:
+            self.preload(url, show_when_ready=True)
+
+    def bring_to_front(self):
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def on_load_finished(self, ok):
+        self.loaded = bool(ok)
+        self.loading = False
+        if self.show_when_ready:
+            self.show_when_ready = False
+            self.bring_to_front()
+
+    def closeEvent(self, event):
+        """Hide instead of closing so the page stays warm"""
+        event.ignore()
+        self.hide()
@@ -0,0 +1,271 @@
+"""
+Content-addressed attachment store for the Todo App
+Moves uploads into public/assets/cas/<aa>/<sha256>.<ext>, rewrites Attachment.path in bulk
+and incrementally sweeps upload files that nothing references
+
+Usage: python attachment_store.py [migrate|gc|run] [--dry-run]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+import psutil
+
+from launcher_settings import DATA_DIR, load_settings
+from maintenance import hidden_window_kwargs, project_database_url, run_process, run_psql
+
+ASSETS_URL = "/assets/"
+CAS_URL = "/assets/cas/"
+REFERENCE_PATTERN = "/assets/[^[:space:]()\"'<>]+"
+
+
+def lower_io_priority():
+    """Run the rest of this process at idle I/O and below-normal CPU priority"""
+    process = psutil.Process()
+    try:
+        if sys.platform == "win32":
+            process.ionice(psutil.IOPRIO_VERYLOW)
+            process.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
+        elif hasattr(psutil, "IOPRIO_CLASS_IDLE"):
+            process.ionice(psutil.IOPRIO_CLASS_IDLE)
+            process.nice(10)
+        else:
+            process.nice(10)
+    except (psutil.Error, OSError, AttributeError):
+        pass
+
+
+def sql_literal(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+class AttachmentStore:
+    """Deduplicating store for the files behind Attachment rows"""
+
+    def __init__(self, project_root, database_url, psql="psql", grace_seconds=86400,
+                 batch_size=200, batch_pause_seconds=0.05, state_path=None):
+        self.assets_dir = os.path.join(project_root, "public", "assets")
+        self.database_url = database_url
+        self.psql = psql
+        self.grace_seconds = grace_seconds
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause_seconds
+        self.state_path = state_path or os.path.join(DATA_DIR, "attachment_gc_state.json")
+
+    def file_for(self, url_path):
+        """Filesystem path of an /assets/... URL path"""
+        relative = url_path[len(ASSETS_URL):].split("?", 1)[0]
+        return os.path.join(self.assets_dir, *relative.split("/"))
+
+    def url_for(self, file_path):
+        """/assets/... URL path of a file inside the assets folder"""
+        return ASSETS_URL + os.path.relpath(file_path, self.assets_dir).replace(os.sep, "/")
+
+    def cas_url(self, digest, extension):
+        return f"{CAS_URL}{digest[:2]}/{digest}{extension}"
+
+    @staticmethod
+    def hash_file(path):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def clean_extension(path):
+        extension = os.path.splitext(path)[1].lower()
+        return extension if re.fullmatch(r"\.[a-z0-9]{1,10}", extension) else ""
+
+    def fetch_attachment_paths(self):
+        """Distinct Attachment.path values"""
+        output = run_psql(self.database_url, ["-A", "-t", "-c", 'SELECT DISTINCT path FROM "Attachment"'], self.psql)
+        return [line for line in output.splitlines() if line]
+
+    def fetch_referenced_paths(self):
+        """Every /assets/ path referenced by attachments, task and project descriptions or comments"""
+        pattern = sql_literal(REFERENCE_PATTERN)
+        query = f"""
+            SELECT path FROM "Attachment"
+            UNION SELECT (regexp_matches(description, {pattern}, 'g'))[1] FROM "Task" WHERE description LIKE '%/assets/%'
+            UNION SELECT (regexp_matches(description, {pattern}, 'g'))[1] FROM "Project" WHERE description LIKE '%/assets/%'
+            UNION SELECT (regexp_matches(content, {pattern}, 'g'))[1] FROM "Comment" WHERE content LIKE '%/assets/%'
+        """
+        output = run_psql(self.database_url, ["-A", "-t", "-c", query], self.psql)
+        return {re.split(r"[?#]", line, 1)[0] for line in output.splitlines() if line}
+
+    def store(self, source):
+        """Place a file in the content-addressed layout; returns (url, already_stored)"""
+        digest = self.hash_file(source)
+        url = self.cas_url(digest, self.clean_extension(source))
+        target = self.file_for(url)
+        if os.path.exists(target):
+            return url, True
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.link(source, target)
+        except OSError:
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target))
+            os.close(fd)
+            shutil.copy2(source, temp_path)
+            os.replace(temp_path, target)
+        return url, False
+
+    def rewrite_paths(self, mapping):
+        """Point Attachment rows at their new paths in a single transaction"""
+        if not mapping:
+            return 0
+        values = ",\n".join(f"({sql_literal(old)}, {sql_literal(new)})" for old, new in mapping.items())
+        sql = (
+            'UPDATE "Attachment" AS a SET path = v.new_path\n'
+            f"FROM (VALUES\n{values}\n) AS v(old_path, new_path)\n"
+            "WHERE a.path = v.old_path;\n"
+        )
+        fd, sql_path = tempfile.mkstemp(suffix=".sql")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(sql)
+            output = run_psql(self.database_url, ["-1", "-f", sql_path], self.psql)
+        finally:
+            os.remove(sql_path)
+        match = re.search(r"UPDATE (\d+)", output)
+        return int(match.group(1)) if match else 0
+
+    def migrate(self, dry_run=False):
+        """Move every attachment outside the store into it and rewrite the rows"""
+        stats = {"files": 0, "deduplicated": 0, "bytes_deduplicated": 0, "missing": 0, "rows_updated": 0}
+        mapping = {}
+        for path in self.fetch_attachment_paths():
+            if not path.startswith(ASSETS_URL) or path.startswith(CAS_URL):
+                continue
+            source = self.file_for(path)
+            if not os.path.isfile(source):
+                stats["missing"] += 1
+                continue
+            stats["files"] += 1
+            if dry_run:
+                continue
+            url, already_stored = self.store(source)
+            if already_stored:
+                stats["deduplicated"] += 1
+                stats["bytes_deduplicated"] += os.path.getsize(source)
+            mapping[path] = url
+        stats["rows_updated"] = self.rewrite_paths(mapping)
+        return stats
+
+    def load_cursor(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("cursor")
+        except (OSError, ValueError):
+            return None
+
+    def save_cursor(self, cursor):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump({"cursor": cursor, "updated": time.strftime("%Y-%m-%dT%H:%M:%S")}, f)
+
+    def iter_files(self, after=None):
+        """Upload files in URL order, starting after the given URL path"""
+        urls = sorted(
+            self.url_for(os.path.join(root, name)) for root, _, files in os.walk(self.assets_dir) for name in files
+        )
+        for url in urls:
+            if after is None or url > after:
+                yield url
+
+    def sweep(self, dry_run=False, max_files=5000):
+        """Remove unreferenced upload files, resuming where the previous run stopped
+
+        Files younger than the grace period are kept so uploads whose task is still
+        being saved are never swept.
+        """
+        stats = {"scanned": 0, "removed": 0, "bytes_freed": 0, "complete": False}
+        if not os.path.isdir(self.assets_dir):
+            stats["complete"] = True
+            return stats
+        referenced = self.fetch_referenced_paths()
+        cutoff = time.time() - self.grace_seconds
+        cursor = self.load_cursor()
+        last = cursor
+        for url in self.iter_files(cursor):
+            if stats["scanned"] >= max_files:
+                break
+            stats["scanned"] += 1
+            last = url
+            path = self.file_for(url)
+            try:
+                info = os.stat(path)
+                if url not in referenced and info.st_mtime < cutoff:
+                    if not dry_run:
+                        os.remove(path)
+                    stats["removed"] += 1
+                    stats["bytes_freed"] += info.st_size
+            except OSError:
+                pass
+            if stats["scanned"] % self.batch_size == 0:
+                time.sleep(self.batch_pause)
+        else:
+            stats["complete"] = True
+            last = None
+        if not dry_run:
+            self.save_cursor(last)
+        return stats
+
+
+def run_storage_tool(timeout=3600, cancel=None):
+    """Run migrate and gc in a low-priority child process and return its summary"""
+    result = run_process(
+        [sys.executable, os.path.abspath(__file__), "run"], timeout, cancel,
+        text=True, **hidden_window_kwargs()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "storage tool failed")
+    results = json.loads(result.stdout.strip().splitlines()[-1])
+    migrate, gc = results["migrate"], results["gc"]
+    return (
+        f"moved {migrate['files']} files ({migrate['deduplicated']} duplicates), "
+        f"swept {gc['removed']} of {gc['scanned']} files, freed {gc['bytes_freed'] // 1024} KB"
+    )
+
+
+def create_store(settings=None):
+    """Store for this project configured from the launcher settings"""
+    settings = settings or load_settings()
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return AttachmentStore(
+        project_root,
+        project_database_url(project_root),
+        settings["psql_path"],
+        settings["storage_gc_grace_seconds"],
+        settings["storage_gc_batch_size"],
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["migrate", "gc", "run"], nargs="?", default="run")
+    parser.add_argument("--dry-run", action="store_true", help="report what would change without changing anything")
+    parser.add_argument("--max-files", type=int, default=None, help="files to scan in this gc pass")
+    args = parser.parse_args(argv)
+
+    lower_io_priority()
+    settings = load_settings()
+    store = create_store(settings)
+    results = {}
+    if args.command in ("migrate", "run"):
+        results["migrate"] = store.migrate(dry_run=args.dry_run)
+    if args.command in ("gc", "run"):
+        results["gc"] = store.sweep(dry_run=args.dry_run, max_files=args.max_files or settings["storage_gc_max_files"])
+    print(json.dumps(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
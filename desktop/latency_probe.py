@@ -0,0 +1,205 @@
+"""
+Continuous latency probe for the Todo App server
+Keeps HDR-style latency histograms over a rolling window for each probed route
+"""
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+
+from PySide6.QtCore import QThread, Signal
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram in the style of HdrHistogram
+
+    Values are recorded in microseconds. Every power-of-two range is split into
+    the same number of linear sub-buckets, so the relative error stays bounded
+    by the number of significant digits whatever the magnitude of the value.
+    """
+
+    def __init__(self, significant_digits=2):
+        largest_single_unit = 2 * 10 ** significant_digits
+        self.sub_bucket_bits = max(1, (largest_single_unit - 1).bit_length())
+        self.sub_bucket_half = 1 << (self.sub_bucket_bits - 1)
+        self.counts = {}
+        self.total_count = 0
+        self.max_value = 0
+
+    def _index_for(self, value):
+        bucket = max(0, value.bit_length() - self.sub_bucket_bits)
+        if bucket == 0:
+            return value
+        return bucket * self.sub_bucket_half + (value >> bucket)
+
+    def _value_for(self, index):
+        """Highest value that maps to the same bucket as index"""
+        if index < 2 * self.sub_bucket_half:
+            return index
+        bucket = index // self.sub_bucket_half - 1
+        sub_bucket = index - bucket * self.sub_bucket_half
+        return ((sub_bucket + 1) << bucket) - 1
+
+    def record(self, value_ms):
+        """Record a latency given in milliseconds"""
+        value = max(0, int(value_ms * 1000))
+        index = self._index_for(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total_count += 1
+        self.max_value = max(self.max_value, value)
+
+    def merge(self, other):
+        """Add all recordings of another histogram to this one"""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += other.total_count
+        self.max_value = max(self.max_value, other.max_value)
+
+    def percentile(self, percent):
+        """Return the latency in milliseconds at the given percentile"""
+        if self.total_count == 0:
+            return None
+        target = max(1, int(round(self.total_count * percent / 100.0)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._value_for(index), self.max_value) / 1000.0
+        return self.max_value / 1000.0
+
+
+class RollingHistogram:
+    """Latency histogram covering only the most recent window of time"""
+
+    def __init__(self, window_seconds=300, slot_seconds=30, significant_digits=2):
+        self.slot_seconds = slot_seconds
+        self.slot_count = max(1, int(window_seconds // slot_seconds))
+        self.significant_digits = significant_digits
+        self.slots = deque()
+        self.errors = deque()
+
+    def _current_slot(self, now):
+        slot_start = int(now // self.slot_seconds) * self.slot_seconds
+        if not self.slots or self.slots[-1][0] != slot_start:
+            self.slots.append((slot_start, LatencyHistogram(self.significant_digits)))
+        self._expire(now)
+        return self.slots[-1][1]
+
+    def _expire(self, now):
+        oldest = int(now // self.slot_seconds) * self.slot_seconds - (self.slot_count - 1) * self.slot_seconds
+        while self.slots and self.slots[0][0] < oldest:
+            self.slots.popleft()
+        while self.errors and self.errors[0] < oldest:
+            self.errors.popleft()
+
+    def record(self, value_ms, now=None):
+        """Record a successful sample"""
+        self._current_slot(time.time() if now is None else now).record(value_ms)
+
+    def record_error(self, now=None):
+        """Record a failed sample"""
+        now = time.time() if now is None else now
+        self.errors.append(now)
+        self._expire(now)
+
+    def snapshot(self, now=None):
+        """Merge the slots inside the window into a single histogram"""
+        self._expire(time.time() if now is None else now)
+        merged = LatencyHistogram(self.significant_digits)
+        for _, histogram in self.slots:
+            merged.merge(histogram)
+        return merged
+
+    def stats(self, now=None):
+        """Summary of the window as a plain dict"""
+        histogram = self.snapshot(now)
+        return {
+            "count": histogram.total_count,
+            "errors": len(self.errors),
+            "p50": histogram.percentile(50),
+            "p99": histogram.percentile(99),
+            "max": histogram.max_value / 1000.0 if histogram.total_count else None,
+        }
+
+
+def is_timeout(error):
+    """Whether a failed request ran into its timeout rather than being refused or rejected"""
+    reason = getattr(error, "reason", None)
+    return isinstance(error, (socket.timeout, TimeoutError)) or isinstance(reason, (socket.timeout, TimeoutError))
+
+
+class LatencyProbe(QThread):
+    """Thread that periodically probes the server and tracks its latency"""
+    stats_updated = Signal(dict)
+    threshold_crossed = Signal(bool, float)
+
+    def __init__(self, base_url, settings):
+        super().__init__()
+        # A callable base URL is resolved on every probe, for servers whose port can change
+        self.base_url = base_url
+        self.interval = settings["probe_interval_seconds"]
+        self.timeout = settings["probe_timeout_seconds"]
+        self.threshold_ms = settings["probe_p99_threshold_ms"]
+        self.targets = {
+            "health": settings["probe_health_route"],
+            "db": settings["probe_db_route"],
+        }
+        self.histograms = {
+            name: RollingHistogram(settings["probe_window_seconds"], settings["probe_slot_seconds"])
+            for name in self.targets
+        }
+        self.above_threshold = False
+        self._stop_event = threading.Event()
+
+    def probe_once(self, path):
+        """Request a single route and return its latency in milliseconds"""
+        start = time.perf_counter()
+        base_url = self.base_url() if callable(self.base_url) else self.base_url
+        with urllib.request.urlopen(base_url.rstrip("/") + path, timeout=self.timeout) as response:
+            response.read()
+        return (time.perf_counter() - start) * 1000.0
+
+    def sample(self):
+        """Probe every target once and return the current window statistics
+
+        A probe that times out is both an error and a latency of at least the timeout, so the
+        stalls the probe is meant to catch show up in p99 instead of only in the error count.
+        """
+        for name, path in self.targets.items():
+            if not path:
+                continue
+            start = time.perf_counter()
+            try:
+                self.histograms[name].record(self.probe_once(path))
+            except (urllib.error.URLError, OSError, ValueError) as e:
+                self.histograms[name].record_error()
+                if is_timeout(e):
+                    elapsed_ms = (time.perf_counter() - start) * 1000.0
+                    self.histograms[name].record(max(elapsed_ms, self.timeout * 1000.0))
+        return {name: histogram.stats() for name, histogram in self.histograms.items() if self.targets[name]}
+
+    def check_threshold(self, stats):
+        """Emit threshold_crossed when the worst p99 moves across the threshold"""
+        p99_values = [s["p99"] for s in stats.values() if s["p99"] is not None]
+        if not p99_values:
+            return
+        worst = max(p99_values)
+        above = worst > self.threshold_ms
+        if above != self.above_threshold:
+            self.above_threshold = above
+            self.threshold_crossed.emit(above, worst)
+
+    def run(self):
+        """Probe the server until stopped"""
+        while not self._stop_event.is_set():
+            stats = self.sample()
+            self.stats_updated.emit(stats)
+            self.check_threshold(stats)
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        """Ask the probe loop to exit and wait for it"""
+        self._stop_event.set()
+        self.wait()
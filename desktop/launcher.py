@@ -3,6 +3,7 @@ import subprocess
 import threading
 import time
 import os
+import urllib.request
 from PySide6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
                                QWidget, QLabel, QPushButton, QTextEdit, QFrame, QMessageBox)
 from PySide6.QtCore import Qt, QTimer, QThread, Signal, QEvent
@@ -11,6 +12,18 @@ import pystray
 from PIL import Image, ImageDraw
 import webbrowser
 import psutil
+from app_window import WEB_ENGINE_AVAILABLE, AppWindow
+from attachment_store import run_storage_tool
+from launcher_settings import DATA_DIR, load_settings
+from lifecycle_trace import TRACE_NAMES, TraceLog, Tracer, slowest_phase
+from latency_probe import LatencyProbe
+from maintenance import (JobHistory, MaintenanceJob, MaintenanceScheduler, backup_database,
+                         check_reminders, project_database_url, vacuum_analyze)
+from memory_recycler import MemoryWatchdog, EventLog, heap_limit_mb, merge_node_options
+from query_stats import EVENTS_FILE, EXPORT_FILE, QueryEventTail, QueryStats
+from runtime_tuner import RESULTS_FILE, best_config, runtime_environment
+from server_adoption import AdoptedProcess, fetch_health, is_project_process, read_build_id
+from tcp_proxy import TcpProxy
 
 class ServerThread(QThread):
     """Thread for running the server"""
@@ -18,71 +31,216 @@ class ServerThread(QThread):
     status_update = Signal(str)
     log_message = Signal(str)
     
-    def __init__(self, launcher):
+    def __init__(self, launcher, activation=False):
         super().__init__()
         self.launcher = launcher
+        # Started by a request held by the on-demand proxy rather than by the user
+        self.activation = activation
         
     def run(self):
         """Start the server in background thread"""
+        with self.launcher.tracer.span("start", activation=self.activation) as trace:
+            trace.args["result"] = "ok" if self.start_server() else "failed"
+            
+    def start_server(self):
+        """Run the start phases, each as a span of the start trace; return whether the server runs"""
+        tracer = self.launcher.tracer
         try:
             self.status_update.emit("Starting server...")
             self.log_message.emit("Checking for existing processes on port 8087...")
             
-            # Check for existing processes
-            existing_pid = self.launcher.check_port_in_use()
-            if existing_pid:
-                self.log_message.emit(f"Found existing process with PID {existing_pid}, terminating...")
-                self.launcher.kill_process_on_port(existing_pid)
-                time.sleep(3)
-                self.log_message.emit("Existing process terminated")
-            else:
-                self.log_message.emit("Port 8087 is available")
-            
-            self.log_message.emit(f"Changing to project directory: {self.launcher.project_root}")
-            
-            # Create the command to run
-            cmd = f'cd /d "{self.launcher.project_root}" && npm run start'
-            self.log_message.emit("Starting Next.js server with command: npm run start")
-            
-            # Start the process with hidden window
-            self.launcher.cmd_process = subprocess.Popen(
-                f'cmd /c "{cmd}"',
-                shell=True,
-                cwd=self.launcher.project_root,
-                creationflags=subprocess.CREATE_NO_WINDOW,
-                stdout=None,
-                stderr=None
-            )
+            # Keep a healthy server from this project instead of restarting it
+            with tracer.span("adoption_check"):
+                adopted = self.launcher.find_adoptable_server(self.log_message.emit)
             
-            self.launcher.server_running = True
-            self.log_message.emit("Server process started in background")
+            # Check for existing processes
+            with tracer.span("port_scan"):
+                for port in self.launcher.server_ports():
+                    if adopted and port == adopted[0]:
+                        continue
+                    existing_pid = self.launcher.check_port_in_use(port)
+                    if existing_pid == os.getpid():
+                        self.log_message.emit(f"Port {port} is held by the launcher proxy")
+                    elif existing_pid:
+                        self.log_message.emit(f"Found existing process with PID {existing_pid} on port {port}, terminating...")
+                        self.launcher.kill_process_on_port(existing_pid)
+                        with tracer.span("settle", port=port):
+                            time.sleep(3)
+                        self.log_message.emit("Existing process terminated")
+                    else:
+                        self.log_message.emit(f"Port {port} is available")
             
-            # Wait for server to start
-            self.log_message.emit("Waiting for server to initialize...")
-            time.sleep(8)
+            if adopted:
+                serve_port, pid = adopted
+                self.launcher.cmd_process = AdoptedProcess(pid)
+                self.launcher.active_port = serve_port
+                self.launcher.server_running = True
+                self.log_message.emit(f"✓ Adopted running server (PID {pid}) on port {serve_port}")
+                ready = True
+            else:
+                self.log_message.emit(f"Changing to project directory: {self.launcher.project_root}")
+                
+                serve_port = self.launcher.next_backend_port()
+                self.log_message.emit(f"Starting Next.js server with command: {self.launcher.server_command(serve_port)}")
+                runtime = self.launcher.runtime_config()
+                if runtime:
+                    self.log_message.emit(f"Applying tuned runtime config {runtime['name']}")
+                
+                # Start the process with hidden window
+                with tracer.span("spawn", port=serve_port):
+                    self.launcher.cmd_process = self.launcher.spawn_server(serve_port)
+                self.launcher.active_port = serve_port
+                
+                self.launcher.server_running = True
+                self.log_message.emit("Server process started in background")
+                
+                # Wait for server to start listening
+                self.log_message.emit("Waiting for server to initialize...")
+                with tracer.span("port_bind", port=serve_port) as span:
+                    ready = self.launcher.wait_for_port(
+                        serve_port, self.launcher.settings["server_start_timeout_seconds"], self.launcher.cmd_process
+                    )
+                    span.args["ready"] = ready
             
             # Verify server is running by checking the port
-            if self.launcher.check_port_in_use():
+            if ready:
+                if serve_port != self.launcher.port:
+                    with tracer.span("proxy", backend_port=serve_port):
+                        try:
+                            if self.launcher.proxy:
+                                self.launcher.proxy.set_backend(serve_port)
+                            else:
+                                self.launcher.start_proxy(serve_port)
+                        except OSError as e:
+                            self.log_message.emit(f"✗ Could not listen on port {self.launcher.port}: {e}")
+                            self.abandon_server()
+                            return False
+                    self.log_message.emit(f"✓ Forwarding port {self.launcher.port} to server on port {serve_port}")
                 self.log_message.emit(f"✓ Server verified running on port {self.launcher.port}")
                 self.status_update.emit("Server running in background")
-                self.log_message.emit("Opening application in browser...")
-                # Open browser
-                webbrowser.open(f'http://localhost:{self.launcher.port}')
+                if self.activation:
+                    # The request that woke the server is already waiting for it
+                    pass
+                elif self.launcher.app_window_enabled():
+                    # Load the app window in the background
+                    self.log_message.emit("Loading application window...")
+                    self.launcher.preload_app_requested.emit()
+                else:
+                    self.log_message.emit("Opening application in browser...")
+                    # Open browser
+                    with tracer.span("browser_open"):
+                        self.launcher.open_browser()
                 self.log_message.emit("✓ Server started successfully!")
                 self.server_started.emit(True)
+                return True
             else:
                 self.log_message.emit("✗ Server failed to start - port not in use")
-                self.launcher.server_running = False
-                self.status_update.emit("Failed to start server")
-                self.server_started.emit(False)
+                self.abandon_server()
+                return False
                 
         except Exception as e:
             error_msg = f"Error starting server: {e}"
             self.log_message.emit(f"✗ {error_msg}")
             self.status_update.emit("Failed to start server")
             self.server_started.emit(False)
+            return False
+            
+    def abandon_server(self):
+        """Stop the server process of a failed start and report the failure"""
+        if self.launcher.cmd_process:
+            self.launcher.kill_process_on_port(self.launcher.cmd_process.pid)
+        self.launcher.cmd_process = None
+        self.launcher.server_running = False
+        self.launcher.active_port = self.launcher.port
+        self.status_update.emit("Failed to start server")
+        self.server_started.emit(False)
+
+class RecycleThread(QThread):
+    """Thread for replacing the server with a fresh process"""
+    recycle_finished = Signal(bool)
+    log_message = Signal(str)
+    
+    def __init__(self, launcher, rss_mb):
+        super().__init__()
+        self.launcher = launcher
+        self.rss_mb = rss_mb
+        
+    def run(self):
+        """Recycle the server as the root span of a recycle trace"""
+        with self.launcher.tracer.span("recycle", rss_mb=round(self.rss_mb)) as trace:
+            trace.args["result"] = "ok" if self.recycle() else "failed"
+            
+    def recycle(self):
+        """Start a replacement, switch traffic to it, then drain and stop the old server"""
+        launcher = self.launcher
+        tracer = launcher.tracer
+        settings = launcher.settings
+        old_process = launcher.cmd_process
+        old_port = launcher.active_port
+        new_port = launcher.next_backend_port()
+        started = time.time()
+        try:
+            self.log_message.emit(
+                f"Server RSS {self.rss_mb:.0f} MB is above the {settings['recycle_rss_ceiling_mb']} MB ceiling, recycling..."
+            )
+            existing_pid = launcher.check_port_in_use(new_port)
+            if existing_pid:
+                self.log_message.emit(f"Found stale process with PID {existing_pid} on port {new_port}, terminating...")
+                launcher.kill_process_on_port(existing_pid)
+            
+            self.log_message.emit(f"Starting replacement server on port {new_port}...")
+            with tracer.span("spawn", port=new_port):
+                new_process = launcher.spawn_server(new_port)
+            
+            with tracer.span("health", port=new_port) as span:
+                healthy = launcher.wait_for_health(new_port, settings["recycle_health_timeout_seconds"])
+                span.args["healthy"] = healthy
+            if not healthy:
+                self.log_message.emit("✗ Replacement server did not become healthy, keeping the current server")
+                launcher.kill_process_on_port(new_process.pid)
+                launcher.recycle_log.record(
+                    "recycle_failed", reason="replacement not healthy", rss_mb=round(self.rss_mb),
+                    old_port=old_port, new_port=new_port, duration_seconds=round(time.time() - started, 1)
+                )
+                self.recycle_finished.emit(False)
+                return False
+            
+            # Switch traffic, then let in-flight connections to the old server finish
+            launcher.proxy.set_backend(new_port)
+            launcher.cmd_process = new_process
+            launcher.active_port = new_port
+            self.log_message.emit(f"✓ Traffic switched to port {new_port}, draining port {old_port}...")
+            
+            with tracer.span("drain", port=old_port) as span:
+                drain_deadline = time.time() + settings["recycle_drain_timeout_seconds"]
+                while launcher.proxy.active_connections(old_port) and time.time() < drain_deadline:
+                    time.sleep(0.5)
+                dropped = launcher.proxy.active_connections(old_port)
+                span.args["dropped_connections"] = dropped
+            
+            if old_process:
+                launcher.kill_process_on_port(old_process.pid)
+            self.log_message.emit("✓ Old server stopped, recycle complete")
+            launcher.recycle_log.record(
+                "recycled", rss_mb=round(self.rss_mb), old_port=old_port, new_port=new_port,
+                dropped_connections=dropped, duration_seconds=round(time.time() - started, 1)
+            )
+            self.recycle_finished.emit(True)
+            return True
+            
+        except Exception as e:
+            self.log_message.emit(f"✗ Error recycling server: {e}")
+            launcher.recycle_log.record("recycle_failed", reason=str(e), old_port=old_port, new_port=new_port)
+            self.recycle_finished.emit(False)
+            return False
 
 class PySideTodoAppLauncher(QMainWindow):
+    open_app_requested = Signal()
+    preload_app_requested = Signal()
+    activation_requested = Signal()
+    maintenance_wake_requested = Signal(str)
+    cold_start_measured = Signal(float)
+    
     def __init__(self):
         super().__init__()
         self.server_running = False
@@ -91,6 +249,39 @@ class PySideTodoAppLauncher(QMainWindow):
         self.cmd_process = None
         self.icon = None
         self.server_thread = None
+        self.settings = load_settings()
+        self.latency_probe = None
+        self.latency_stats = {}
+        self.active_port = self.port
+        self.proxy = None
+        self.memory_watchdog = None
+        self.recycle_thread = None
+        self.last_recycle_time = 0
+        self.server_rss_mb = None
+        self.recycle_log = EventLog(os.path.join(DATA_DIR, "recycle_events.jsonl"))
+        self.app_window = None
+        self.maintenance_scheduler = None
+        self.finishing_schedulers = []
+        self.maintenance_history = JobHistory(os.path.join(DATA_DIR, "maintenance_history.jsonl"))
+        self.backup_dir = os.path.join(DATA_DIR, "backups")
+        self.runtime_tuning_path = RESULTS_FILE
+        self.tracer = Tracer(TraceLog(max_traces=self.settings["trace_max_traces"]), root_names=TRACE_NAMES)
+        self.query_stats = QueryStats(self.settings["query_stats_max_statements"])
+        self.query_stats_path = EXPORT_FILE
+        self.query_events_path = EVENTS_FILE
+        self.query_tail = None
+        self.query_stats_timer = QTimer()
+        self.query_stats_timer.timeout.connect(self.export_query_stats)
+        self.on_demand_armed = False
+        self.cold_starts = []
+        self.on_demand_log = EventLog(os.path.join(DATA_DIR, "on_demand_events.jsonl"))
+        self.idle_timer = QTimer()
+        self.idle_timer.timeout.connect(self.check_idle)
+        self.open_app_requested.connect(self.show_app_window)
+        self.preload_app_requested.connect(self.preload_app_window)
+        self.activation_requested.connect(self.activate_server)
+        self.maintenance_wake_requested.connect(self.wake_for_maintenance)
+        self.cold_start_measured.connect(self.on_cold_start)
         
         # Initialize UI
         self.init_ui()
@@ -260,13 +451,13 @@ class PySideTodoAppLauncher(QMainWindow):
         y = (screen.height() - window.height()) // 2
         self.move(x, y)
         
-    def create_icon_image(self):
+    def create_icon_image(self, fill=(45, 123, 255, 255), outline=(33, 91, 189, 255)):
         """Create a simple icon for the system tray"""
         image = Image.new('RGBA', (64, 64), color=(0, 0, 0, 0))
         draw = ImageDraw.Draw(image)
         
         # Draw a modern todo list icon
-        draw.ellipse([8, 8, 56, 56], fill=(45, 123, 255, 255), outline=(33, 91, 189, 255), width=2)
+        draw.ellipse([8, 8, 56, 56], fill=fill, outline=outline, width=2)
         draw.line([20, 32, 28, 40], fill='white', width=3)
         draw.line([28, 40, 44, 24], fill='white', width=3)
         draw.ellipse([18, 18, 22, 22], fill='white')
@@ -274,11 +465,12 @@ class PySideTodoAppLauncher(QMainWindow):
         
         return image
         
-    def check_port_in_use(self):
+    def check_port_in_use(self, port=None):
         """Check if port is in use"""
+        port = port or self.port
         try:
             for conn in psutil.net_connections(kind='inet'):
-                if conn.laddr.port == self.port and conn.status == psutil.CONN_LISTEN:
+                if conn.laddr.port == port and conn.status == psutil.CONN_LISTEN:
                     return conn.pid
             return None
         except:
@@ -286,58 +478,425 @@ class PySideTodoAppLauncher(QMainWindow):
     
     def kill_process_on_port(self, pid):
         """Kill process more aggressively"""
-        try:
-            p = psutil.Process(pid)
+        if pid == os.getpid():
+            return
+        with self.tracer.span("kill_process", pid=pid):
+            try:
+                p = psutil.Process(pid)
             
-            # Get all child processes
-            children = p.children(recursive=True)
+                # Get all child processes
+                children = p.children(recursive=True)
             
-            # Kill children first
-            for child in children:
-                try:
-                    child.terminate()
-                except:
-                    pass
+                # Kill children first
+                for child in children:
+                    try:
+                        child.terminate()
+                    except:
+                        pass
             
-            # Wait for children to terminate
-            psutil.wait_procs(children, timeout=3)
+                # Wait for children to terminate
+                psutil.wait_procs(children, timeout=3)
             
-            # Force kill any remaining children
-            for child in children:
+                # Force kill any remaining children
+                for child in children:
+                    try:
+                        if child.is_running():
+                            child.kill()
+                    except:
+                        pass
+            
+                # Now kill the main process
+                p.terminate()
                 try:
-                    if child.is_running():
-                        child.kill()
+                    p.wait(timeout=3)
+                except psutil.TimeoutExpired:
+                    p.kill()
+                    p.wait(timeout=2)
+                
+                time.sleep(1)
+            except Exception as e:
+                # If psutil fails, try using taskkill
+                try:
+                    import subprocess
+                    subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)], 
+                                 capture_output=True, creationflags=subprocess.CREATE_NO_WINDOW)
                 except:
                     pass
             
-            # Now kill the main process
-            p.terminate()
+    def recycle_enabled(self):
+        """Whether the server runs behind the launcher proxy so it can be recycled"""
+        return self.settings["recycle_rss_ceiling_mb"] > 0
+        
+    def on_demand_enabled(self):
+        """Whether the server is only started when a request arrives"""
+        return self.settings["on_demand_enabled"]
+        
+    def proxy_enabled(self):
+        """Whether the server runs on an internal port behind the launcher proxy"""
+        return self.recycle_enabled() or self.on_demand_enabled()
+        
+    def server_ports(self):
+        """All ports the server may listen on"""
+        if not self.proxy_enabled():
+            return [self.port]
+        return [self.port] + list(self.settings["backend_ports"])
+        
+    def next_backend_port(self):
+        """Port for the next server process"""
+        if not self.proxy_enabled():
+            return self.port
+        for port in self.settings["backend_ports"]:
+            if port != self.active_port:
+                return port
+        return self.settings["backend_ports"][0]
+        
+    def server_command(self, port):
+        """Command that starts the Next.js server on the given port"""
+        if self.settings["server_command"]:
+            return self.settings["server_command"].format(port=port)
+        if port == self.port:
+            return 'npm run start'
+        return f'npx next start -p {port}'
+        
+    def runtime_config(self):
+        """Best runtime configuration found by runtime_tuner.py, or None"""
+        if not self.settings["tuning_apply"]:
+            return None
+        return best_config(self.runtime_tuning_path)
+        
+    def spawn_server(self, port):
+        """Start a server process on the given port with a hidden window"""
+        env = os.environ.copy()
+        heap_limit = heap_limit_mb(self.settings["recycle_rss_ceiling_mb"], self.settings["recycle_heap_fraction"])
+        node_flags, runtime_env = runtime_environment(self.runtime_config(), heap_limit)
+        if node_flags:
+            env["NODE_OPTIONS"] = merge_node_options(env.get("NODE_OPTIONS"), node_flags)
+        env.update(runtime_env)
+        if self.settings["maintenance_enabled"]:
+            # Reminder checks are scheduled by the launcher instead of the in-process cron
+            env["REMINDER_SCHEDULER"] = "launcher"
+        if self.settings["query_capture_enabled"]:
+            # A file rather than a pipe, so the server never depends on the launcher reading it
+            os.makedirs(os.path.dirname(self.query_events_path), exist_ok=True)
+            env["PRISMA_QUERY_EVENTS_FILE"] = self.query_events_path
+        if sys.platform != "win32":
+            process = subprocess.Popen(
+                self.server_command(port),
+                shell=True,
+                cwd=self.project_root,
+                start_new_session=True,
+                stdout=None,
+                stderr=None,
+                env=env
+            )
+        else:
+            cmd = f'cd /d "{self.project_root}" && {self.server_command(port)}'
+            process = subprocess.Popen(
+                f'cmd /c "{cmd}"',
+                shell=True,
+                cwd=self.project_root,
+                creationflags=subprocess.CREATE_NO_WINDOW,
+                stdout=None,
+                stderr=None,
+                env=env
+            )
+        return process
+        
+    def wait_for_port(self, port, timeout, process=None):
+        """Wait until something listens on a port, giving up early if process exits"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.check_port_in_use(port):
+                return True
+            if process is not None and process.poll() is not None:
+                return False
+            time.sleep(0.25)
+        return bool(self.check_port_in_use(port))
+        
+    def wait_for_port_free(self, port, timeout):
+        """Wait until nothing listens on a port"""
+        deadline = time.time() + timeout
+        while self.check_port_in_use(port):
+            if time.time() >= deadline:
+                return False
+            time.sleep(0.1)
+        return True
+        
+    def wait_for_health(self, port, timeout):
+        """Poll /api/health on a port until it answers or the timeout expires"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
             try:
-                p.wait(timeout=3)
-            except psutil.TimeoutExpired:
-                p.kill()
-                p.wait(timeout=2)
-                
+                with urllib.request.urlopen(f'http://localhost:{port}/api/health', timeout=5) as response:
+                    if response.status == 200:
+                        return True
+            except Exception:
+                pass
             time.sleep(1)
-        except Exception as e:
-            # If psutil fails, try using taskkill
+        return False
+        
+    def find_adoptable_server(self, log):
+        """Return (port, pid) of a healthy server of this project and build that is already listening"""
+        if not self.settings["adopt_existing_server"]:
+            return None
+        candidates = self.settings["backend_ports"] if self.proxy_enabled() else [self.port]
+        build_id = read_build_id(self.project_root)
+        process_names = [name.lower() for name in self.settings["server_process_names"]]
+        for port in candidates:
+            pid = self.check_port_in_use(port)
+            if not pid or pid == os.getpid():
+                continue
+            if not is_project_process(pid, self.project_root, process_names):
+                log(f"Process {pid} on port {port} is not this project's server")
+                continue
+            health = fetch_health(port)
+            if health is None:
+                log(f"Server {pid} on port {port} failed its health check")
+                continue
+            if not build_id or health.get("buildId") != build_id:
+                log(f"Server {pid} on port {port} runs a different build")
+                continue
+            return port, pid
+        return None
+        
+    def start_proxy(self, backend_port):
+        """Forward the app port to the server on backend_port"""
+        proxy = TcpProxy(self.port, backend_port)
+        proxy.start()
+        self.proxy = proxy
+        
+    def stop_proxy(self):
+        """Release the app port"""
+        if self.proxy:
+            self.proxy.stop()
+            self.proxy = None
+            
+    def start_memory_watchdog(self):
+        """Watch the server RSS when recycling is enabled"""
+        if not self.recycle_enabled() or (self.memory_watchdog and self.memory_watchdog.isRunning()):
+            return
+        self.memory_watchdog = MemoryWatchdog(
+            lambda: self.cmd_process.pid if self.cmd_process else None,
+            self.settings["recycle_rss_ceiling_mb"],
+            self.settings["recycle_check_interval_seconds"]
+        )
+        self.memory_watchdog.rss_sampled.connect(self.on_rss_sampled)
+        self.memory_watchdog.ceiling_exceeded.connect(self.on_memory_ceiling)
+        self.memory_watchdog.start()
+        
+    def stop_memory_watchdog(self):
+        """Stop the memory watchdog and wait for any recycle in progress"""
+        if self.memory_watchdog:
+            self.memory_watchdog.stop()
+            self.memory_watchdog = None
+        if self.recycle_thread and self.recycle_thread.isRunning():
+            self.log_to_console("Waiting for server recycle to finish...")
+            self.recycle_thread.wait()
+        self.server_rss_mb = None
+        
+    def on_rss_sampled(self, rss_mb):
+        """Remember the latest server memory sample"""
+        self.server_rss_mb = rss_mb
+        
+    def on_memory_ceiling(self, rss_mb):
+        """Recycle the server when it grows past the memory ceiling"""
+        if not self.server_running or not self.proxy:
+            return
+        if self.recycle_thread and self.recycle_thread.isRunning():
+            return
+        if time.time() - self.last_recycle_time < self.settings["recycle_cooldown_seconds"]:
+            return
+        self.last_recycle_time = time.time()
+        self.recycle_thread = RecycleThread(self, rss_mb)
+        self.recycle_thread.log_message.connect(self.log_to_console)
+        self.recycle_thread.start()
+        
+    def create_maintenance_jobs(self, cancel):
+        """Maintenance jobs run against the local server and database; cancel ends a running job"""
+        settings = self.settings
+        base_url = f'http://localhost:{self.port}'
+        database_url = project_database_url(self.project_root)
+        backup_dir = self.backup_dir
+        return [
+            # Reminders only fire on exact overdue hours, so they must not drift
+            MaintenanceJob(
+                "reminders", self.with_server("reminders", lambda: check_reminders(base_url)),
+                settings["maintenance_reminder_interval_seconds"], deferrable=False
+            ),
+            MaintenanceJob(
+                "vacuum_analyze", lambda: vacuum_analyze(database_url, settings["psql_path"], cancel),
+                24 * 3600, preferred_hour=settings["maintenance_vacuum_hour"], requires_server=False
+            ),
+            MaintenanceJob(
+                "backup", self.with_server(
+                    "backup", lambda: backup_database(base_url, backup_dir, settings["maintenance_backup_keep"], cancel)
+                ),
+                24 * 3600, preferred_hour=settings["maintenance_backup_hour"]
+            ),
+            MaintenanceJob(
+                "attachments", lambda: run_storage_tool(cancel=cancel),
+                24 * 3600, preferred_hour=settings["storage_hour"], requires_server=False
+            ),
+        ]
+        
+    def with_server(self, name, action):
+        """Wrap a job action so a suspended on-demand server is started before it runs
+
+        The server is started directly instead of by the job's request through the proxy,
+        so maintenance wakes are not counted as cold starts a user waited for.
+        """
+        def run():
+            if self.on_demand_armed and not self.server_running:
+                self.maintenance_wake_requested.emit(name)
+                deadline = time.time() + self.settings["on_demand_start_timeout_seconds"]
+                while not (self.server_running and self.proxy and self.proxy.ready.is_set()):
+                    if time.time() >= deadline or not self.on_demand_armed:
+                        raise RuntimeError("server did not start for maintenance")
+                    time.sleep(0.25)
+            return action()
+        return run
+        
+    def wake_for_maintenance(self, name):
+        """Start the suspended on-demand server for a maintenance job"""
+        self.log_to_console(f"Starting suspended server for maintenance job '{name}'...")
+        self.on_demand_log.record("maintenance_wake", job=name)
+        self.activate_server()
+        
+    def maintenance_busy_reason(self):
+        """Why maintenance should wait right now, or None when the machine and server are idle"""
+        cpu = psutil.cpu_percent(interval=1.0)
+        if cpu > self.settings["maintenance_max_cpu_percent"]:
+            return f"CPU busy ({cpu:.0f}%)"
+        stats = self.latency_stats.get("db") or self.latency_stats.get("health")
+        if stats and stats["p99"] is not None and stats["p99"] > self.settings["maintenance_max_p99_ms"]:
+            return f"server slow (p99 {stats['p99']:.0f} ms)"
+        return None
+        
+    def start_maintenance_scheduler(self):
+        """Start running maintenance jobs while the server is up"""
+        if not self.settings["maintenance_enabled"]:
+            return
+        if self.maintenance_scheduler and self.maintenance_scheduler.isRunning():
+            return
+        cancel = threading.Event()
+        self.maintenance_scheduler = MaintenanceScheduler(
+            self.create_maintenance_jobs(cancel),
+            self.maintenance_history,
+            self.maintenance_busy_reason,
+            # Jobs wrapped by with_server start a suspended on-demand server themselves
+            lambda: self.server_running or self.on_demand_armed,
+            self.settings["maintenance_postpone_seconds"],
+            self.settings["maintenance_max_postpone_seconds"],
+            stop_event=cancel
+        )
+        self.maintenance_scheduler.log_message.connect(self.log_to_console)
+        self.maintenance_scheduler.start()
+        
+    def stop_maintenance_scheduler(self):
+        """Stop the maintenance scheduler, cancelling a running job without blocking the window
+
+        psql and storage jobs are killed right away; a job waiting on the server fails once the
+        server is stopped, so a scheduler that is still busy is left to finish in the background.
+        """
+        if self.maintenance_scheduler:
+            scheduler = self.maintenance_scheduler
+            self.maintenance_scheduler = None
+            if not scheduler.stop(timeout=1):
+                self.log_to_console("Maintenance job still finishing in the background...")
+                self.finishing_schedulers.append(scheduler)
+                scheduler.finished.connect(lambda: self.finishing_schedulers.remove(scheduler))
+                
+    def wait_for_finishing_schedulers(self, timeout):
+        """Give schedulers stopped mid-job up to timeout seconds to end before the launcher exits"""
+        deadline = time.time() + timeout
+        for scheduler in list(self.finishing_schedulers):
+            scheduler.wait(int(max(0.0, deadline - time.time()) * 1000))
+            
+    def arm_on_demand(self):
+        """Listen on the app port and start the server only when a request arrives"""
+        with self.tracer.span("arm"):
+            self.log_to_console(f"On-demand mode: listening on port {self.port}...")
             try:
-                import subprocess
-                subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)], 
-                             capture_output=True, creationflags=subprocess.CREATE_NO_WINDOW)
-            except:
-                pass
+                if not self.proxy:
+                    self.free_port(self.port)
+                    self.proxy = TcpProxy(
+                        self.port,
+                        on_activate=self.activation_requested.emit,
+                        on_cold_start=self.cold_start_measured.emit,
+                        activation_timeout=self.settings["on_demand_start_timeout_seconds"]
+                    )
+                    self.proxy.start()
+            except Exception as e:
+                self.log_to_console(f"✗ Error listening on port {self.port}: {e}")
+                self.status_label.setText("Failed to start server")
+                self.proxy = None
+                return
+            self.on_demand_armed = True
+            self.idle_timer.start(30 * 1000)
+            self.start_maintenance_scheduler()
+            self.status_label.setText("Waiting for first request")
+            self.log_to_console("✓ Server will start on the first request to the app")
+        
+    def activate_server(self):
+        """Start the server for a request held by the on-demand proxy"""
+        if not self.on_demand_armed or self.server_running:
+            return
+        if self.server_thread and self.server_thread.isRunning():
+            return
+        self.log_to_console("Request received, starting server on demand...")
+        self.start_server_thread(activation=True)
+        
+    def on_cold_start(self, seconds):
+        """Report how long the first request after a suspend waited for the server"""
+        self.cold_starts.append(seconds)
+        del self.cold_starts[:-50]
+        self.log_to_console(f"✓ First request served after {seconds:.1f}s cold start")
+        self.on_demand_log.record("cold_start", seconds=round(seconds, 2))
+        
+    def check_idle(self):
+        """Suspend the on-demand server after a period without requests"""
+        if not self.on_demand_armed or not self.server_running or not self.proxy:
+            return
+        if self.recycle_thread and self.recycle_thread.isRunning():
+            return
+        idle = self.proxy.idle_seconds()
+        if idle >= self.settings["on_demand_idle_minutes"] * 60:
+            self.suspend_server(idle)
             
+    def suspend_server(self, idle_seconds=0):
+        """Stop the server but keep listening so the next request starts it again"""
+        with self.tracer.span("suspend", idle_seconds=round(idle_seconds)):
+            self.log_to_console(f"No requests for {idle_seconds / 60:.0f} minutes, suspending server...")
+            self.proxy.suspend()
+            self.server_running = False
+            self.stop_latency_probe()
+            self.stop_memory_watchdog()
+            if self.cmd_process:
+                self.kill_process_on_port(self.cmd_process.pid)
+                self.cmd_process = None
+            for port in self.settings["backend_ports"]:
+                self.free_port(port)
+            self.active_port = self.port
+            self.on_demand_log.record("suspended", idle_seconds=round(idle_seconds))
+            self.status_label.setText("Suspended, waiting for requests")
+            self.log_to_console("✓ Server suspended")
+        
     def start_server(self):
         """Start the server in a separate thread"""
-        if self.server_running:
+        if self.server_running or self.on_demand_armed:
             self.log_to_console("Server is already running")
             return
             
+        if self.on_demand_enabled():
+            self.arm_on_demand()
+            return
+            
         self.log_to_console("Initializing server startup...")
+        self.start_server_thread()
         
-        # Start server thread
-        self.server_thread = ServerThread(self)
+    def start_server_thread(self, activation=False):
+        """Run ServerThread with its signals connected"""
+        self.server_thread = ServerThread(self, activation)
         self.server_thread.status_update.connect(self.update_status)
         self.server_thread.server_started.connect(self.on_server_started)
         self.server_thread.log_message.connect(self.log_to_console)
@@ -349,81 +908,237 @@ class PySideTodoAppLauncher(QMainWindow):
         
     def on_server_started(self, success):
         """Handle server start completion"""
-        if success:
+        if not success and self.on_demand_armed and self.proxy:
+            self.proxy.fail_activation()
+        if success and self.settings["query_capture_enabled"]:
+            self.start_query_tail()
+            self.query_stats_timer.start(self.settings["query_stats_export_interval_seconds"] * 1000)
+        if success and self.on_demand_armed:
+            self.start_latency_probe()
+            self.start_memory_watchdog()
+        elif success:
             self.log_to_console("Auto-minimizing to system tray...")
             # Auto-minimize to tray after successful start
             QTimer.singleShot(1500, self.hide_to_tray)
+            self.start_latency_probe()
+            self.start_memory_watchdog()
+            self.start_maintenance_scheduler()
             
-    def stop_server(self):
-        """Stop the server"""
+    def start_query_tail(self):
+        """Follow the query events the server appends to its event file"""
+        if self.query_tail and self.query_tail.is_running():
+            return
+        self.query_tail = QueryEventTail(
+            self.query_events_path, self.query_stats, self.settings["query_events_max_mb"] * 1024 * 1024
+        )
+        self.query_tail.start()
+        
+    def stop_query_tail(self):
+        """Read the remaining query events and stop following the file"""
+        if self.query_tail:
+            self.query_tail.stop()
+            self.query_tail = None
+            
+    def export_query_stats(self):
+        """Write the ranked query statistics to the metrics export file"""
+        if self.settings["query_capture_enabled"] and self.query_stats.statements:
+            self.query_stats.export(self.query_stats_path)
+            
+    def start_latency_probe(self):
+        """Start probing server latency in the background"""
+        if self.latency_probe and self.latency_probe.isRunning():
+            return
+        self.latency_stats = {}
+        if self.on_demand_enabled():
+            # Probe the server directly so probes do not keep an idle server awake
+            base_url = lambda: f'http://localhost:{self.active_port}'
+        else:
+            base_url = f'http://localhost:{self.port}'
+        self.latency_probe = LatencyProbe(base_url, self.settings)
+        self.latency_probe.stats_updated.connect(self.on_latency_stats)
+        self.latency_probe.threshold_crossed.connect(self.on_latency_threshold)
+        self.latency_probe.start()
+        self.log_to_console("Latency probe started")
+        
+    def stop_latency_probe(self):
+        """Stop the latency probe if it is running"""
+        if self.latency_probe:
+            self.latency_probe.stop()
+            self.latency_probe = None
+            self.latency_stats = {}
+            self.update_tray_health()
+            
+    def format_latency(self, value):
+        """Format a latency in milliseconds for display"""
+        return "n/a" if value is None else f"{value:.0f} ms"
+        
+    def on_latency_stats(self, stats):
+        """Handle fresh latency statistics from the probe"""
+        self.latency_stats = stats
+        self.update_tray_health()
+        
+    def on_latency_threshold(self, above, p99):
+        """Notify when p99 latency crosses the configured threshold"""
+        threshold = self.settings["probe_p99_threshold_ms"]
+        if above:
+            message = f"p99 latency is {self.format_latency(p99)} (threshold {threshold} ms)"
+            self.log_to_console(f"WARNING: {message}")
+            self.notify("Todo App server is slow", message)
+        else:
+            message = f"p99 latency back to {self.format_latency(p99)}"
+            self.log_to_console(f"✓ {message}")
+            self.notify("Todo App server recovered", message)
+            
+    def notify(self, title, message):
+        """Show a desktop notification from the tray icon"""
         try:
-            self.log_to_console("Stopping server...")
-            self.status_label.setText("Stopping server...")
-            QApplication.processEvents()
+            if self.icon:
+                self.icon.notify(message, title)
+        except Exception as e:
+            print(f"Error showing notification: {e}")
             
-            self.server_running = False
+    def health_summary(self):
+        """Return the server health and a one-line latency summary"""
+        if not self.server_running:
+            return ("Suspended" if self.on_demand_armed else "Stopped"), ""
+        stats = self.latency_stats.get("db") or self.latency_stats.get("health")
+        if not stats or stats["count"] == 0:
+            if stats and stats["errors"]:
+                return "Not responding", ""
+            return "Starting", ""
+        summary = f"p50 {self.format_latency(stats['p50'])} / p99 {self.format_latency(stats['p99'])}"
+        if stats["errors"]:
+            summary += f", {stats['errors']} failed"
+        if stats["errors"] or (self.latency_probe and self.latency_probe.above_threshold):
+            return "Degraded", summary
+        return "Healthy", summary
+        
+    def update_tray_health(self):
+        """Reflect the current latency in the tray tooltip and icon"""
+        if not self.icon:
+            return
+        status, summary = self.health_summary()
+        self.icon.title = f"Todo App - {status}" + (f" ({summary})" if summary else "")
+        if status == "Degraded":
+            self.icon.icon = self.create_icon_image(fill=(255, 152, 0, 255), outline=(200, 110, 0, 255))
+        elif status == "Not responding":
+            self.icon.icon = self.create_icon_image(fill=(244, 67, 54, 255), outline=(180, 40, 30, 255))
+        else:
+            self.icon.icon = self.create_icon_image()
             
-            # First, try to kill our specific process if we have a reference
-            if self.cmd_process:
-                try:
-                    self.cmd_process.terminate()
-                    self.log_to_console("Terminating main server process...")
-                    time.sleep(2)
-                    
-                    # Force kill if still running
-                    if self.cmd_process.poll() is None:
-                        self.cmd_process.kill()
-                        self.log_to_console("Force killed main server process")
-                        
-                except Exception as e:
-                    self.log_to_console(f"Error terminating main process: {e}")
-                self.cmd_process = None
+    def stop_server(self):
+        """Stop the server"""
+        with self.tracer.span("stop"):
+            try:
+                self.log_to_console("Stopping server...")
+                self.status_label.setText("Stopping server...")
+                QApplication.processEvents()
+                
+                self.server_running = False
+                self.on_demand_armed = False
+                self.idle_timer.stop()
+                with self.tracer.span("stop_monitors"):
+                    self.stop_latency_probe()
+                    self.stop_memory_watchdog()
+                    self.stop_maintenance_scheduler()
+                    self.stop_proxy()
+                    self.query_stats_timer.stop()
+                    self.stop_query_tail()
+                    self.export_query_stats()
+                
+                # First, try to kill our specific process if we have a reference
+                if self.cmd_process:
+                    with self.tracer.span("terminate", pid=self.cmd_process.pid):
+                        try:
+                            self.cmd_process.terminate()
+                            self.log_to_console("Terminating main server process...")
+                            try:
+                                self.cmd_process.wait(timeout=2)
+                            except subprocess.TimeoutExpired:
+                                pass
+                            
+                            # Force kill if still running
+                            if self.cmd_process.poll() is None:
+                                self.cmd_process.kill()
+                                self.log_to_console("Force killed main server process")
+                                
+                        except Exception as e:
+                            self.log_to_console(f"Error terminating main process: {e}")
+                    self.cmd_process = None
+                
+                for port in self.server_ports():
+                    self.free_port(port)
+                self.active_port = self.port
+                
+                self.status_label.setText("Server stopped")
+                self.log_to_console("✓ Server stop process completed")
+                
+            except Exception as e:
+                error_msg = f"Error stopping server: {e}"
+                self.log_to_console(f"✗ {error_msg}")
+                self.status_label.setText("Error stopping server")
             
-            # Kill any remaining processes on our port
+    def free_port(self, port):
+        """Kill any remaining processes listening on a port"""
+        with self.tracer.span("free_port", port=port):
             max_attempts = 3
             for attempt in range(max_attempts):
-                existing_pid = self.check_port_in_use()
+                existing_pid = self.check_port_in_use(port)
                 if existing_pid:
-                    self.log_to_console(f"Attempt {attempt + 1}: Found process on port {self.port} (PID: {existing_pid})")
+                    self.log_to_console(f"Attempt {attempt + 1}: Found process on port {port} (PID: {existing_pid})")
                     self.kill_process_on_port(existing_pid)
-                    time.sleep(2)
-                    
+                
                     # Check if it's still there
-                    if not self.check_port_in_use():
+                    if self.wait_for_port_free(port, 2):
                         self.log_to_console("✓ Process terminated successfully")
                         break
                     else:
                         self.log_to_console(f"Process still running, attempt {attempt + 1} of {max_attempts}")
                 else:
-                    self.log_to_console("✓ No process found on port 8087")
+                    self.log_to_console(f"✓ No process found on port {port}")
                     break
-            
+        
             # Final check and aggressive cleanup
-            final_pid = self.check_port_in_use()
-            if final_pid:
-                self.log_to_console(f"WARNING: Process {final_pid} still running on port {self.port}")
+            final_pid = self.check_port_in_use(port)
+            if final_pid and final_pid != os.getpid():
+                self.log_to_console(f"WARNING: Process {final_pid} still running on port {port}")
                 # Try using taskkill as last resort
                 try:
-                    import subprocess
                     subprocess.run(['taskkill', '/F', '/PID', str(final_pid)], 
                                  capture_output=True, creationflags=subprocess.CREATE_NO_WINDOW)
                     self.log_to_console(f"Used taskkill /F on PID {final_pid}")
                     time.sleep(1)
                 except:
                     self.log_to_console("Failed to use taskkill")
-            
-            self.status_label.setText("Server stopped")
-            self.log_to_console("✓ Server stop process completed")
-            
-        except Exception as e:
-            error_msg = f"Error stopping server: {e}"
-            self.log_to_console(f"✗ {error_msg}")
-            self.status_label.setText("Error stopping server")
-            
-    def open_browser(self):
-        """Open the app in browser"""
+                
+    def open_browser(self, icon_param=None, item=None):
+        """Open the app in the app window or the browser"""
+        if self.app_window_enabled():
+            # May be called from the tray thread, so hand over to the Qt thread
+            self.open_app_requested.emit()
+            return
         webbrowser.open(f'http://localhost:{self.port}')
         
+    def app_window_enabled(self):
+        """Whether the app opens in the embedded window"""
+        return self.settings["app_window_mode"] and WEB_ENGINE_AVAILABLE
+        
+    def get_app_window(self):
+        """Create the embedded app window on first use"""
+        if self.app_window is None:
+            self.app_window = AppWindow(DATA_DIR, self.settings["app_window_cache_mb"])
+        return self.app_window
+        
+    def preload_app_window(self):
+        """Load the app in the hidden window once the server is ready"""
+        self.get_app_window().preload(
+            f'http://localhost:{self.port}', show_when_ready=self.settings["app_window_show_on_start"]
+        )
+        
+    def show_app_window(self):
+        """Show the already loaded app window"""
+        self.get_app_window().show_app(f'http://localhost:{self.port}')
+        
     def hide_to_tray(self):
         """Hide window to system tray"""
         self.log_to_console("Window minimized to system tray")
@@ -440,15 +1155,48 @@ class PySideTodoAppLauncher(QMainWindow):
         try:
             # Ensure this runs in the main thread by using QTimer
             def show_dialog():
-                status = "Running" if self.server_running else "Stopped"
-                port_info = f"Port: {self.port}"
-                if self.server_running:
-                    pid = self.check_port_in_use()
-                    if pid:
-                        port_info += f" (PID: {pid})"
+                status, _ = self.health_summary()
+                lines = [f"Server Status: {status}", f"Port: {self.port}"]
+                for name, stats in self.latency_stats.items():
+                    lines.append(
+                        f"{name}: p50 {self.format_latency(stats['p50'])}, "
+                        f"p99 {self.format_latency(stats['p99'])}, "
+                        f"{stats['count']} ok / {stats['errors']} failed"
+                    )
+                for job in ("reminders", "vacuum_analyze", "backup", "attachments"):
+                    last = self.maintenance_history.last(job)
+                    if last:
+                        lines.append(f"{job}: {last['status']} at {last['started'] or last['scheduled']}")
+                if self.cold_starts:
+                    ordered = sorted(self.cold_starts)
+                    lines.append(
+                        f"Cold starts: {len(ordered)}, median {ordered[len(ordered) // 2]:.1f}s, "
+                        f"worst {ordered[-1]:.1f}s"
+                    )
+                runtime = self.runtime_config()
+                if runtime:
+                    lines.append(f"Runtime config: {runtime['name']}")
+                for name in ("start", "stop"):
+                    trace = self.tracer.last(name)
+                    if trace:
+                        phase = slowest_phase(trace)
+                        slowest = f", slowest phase {phase['name']} {phase['duration_ms'] / 1000:.1f}s" if phase else ""
+                        lines.append(f"Last {name}: {trace['duration_ms'] / 1000:.1f}s{slowest}")
+                top_queries = self.query_stats.top("total", 3)
+                if top_queries:
+                    lines.append("Top queries by total time:")
+                    for query in top_queries:
+                        lines.append(
+                            f"  {query['count']}x, {query['total_ms']:.0f} ms total, "
+                            f"p99 {self.format_latency(query['p99_ms'])}: {query['statement'][:80]}"
+                        )
+                if self.server_rss_mb is not None:
+                    lines.append(
+                        f"Memory: {self.server_rss_mb:.0f} MB of {self.settings['recycle_rss_ceiling_mb']} MB ceiling"
+                    )
                 msg_box = QMessageBox()
                 msg_box.setWindowTitle("Todo App Status")
-                msg_box.setText(f"Server Status: {status}\n{port_info}")
+                msg_box.setText("\n".join(lines))
                 msg_box.setStandardButtons(QMessageBox.Ok)
                 msg_box.exec()
             
@@ -460,22 +1208,26 @@ class PySideTodoAppLauncher(QMainWindow):
     def quit_application(self, icon_param=None, item=None):
         """Quit the application"""
         try:
-            self.log_to_console("Shutting down application...")
-            
-            # First stop the server with enhanced cleanup
-            self.stop_server()
-            
-            # Give it a moment to clean up
-            time.sleep(2)
-            
-            # Double-check port cleanup
-            final_check_pid = self.check_port_in_use()
-            if final_check_pid:
-                self.log_to_console(f"Final cleanup: killing remaining process {final_check_pid}")
-                self.kill_process_on_port(final_check_pid)
-                time.sleep(1)
-            
-            self.log_to_console("Application shutdown complete")
+            with self.tracer.span("quit"):
+                self.log_to_console("Shutting down application...")
+                
+                # First stop the server with enhanced cleanup
+                self.stop_server()
+                
+                # Give it a moment to clean up
+                with self.tracer.span("settle"):
+                    time.sleep(2)
+                
+                # Double-check port cleanup
+                with self.tracer.span("final_check"):
+                    final_check_pid = self.check_port_in_use()
+                    if final_check_pid:
+                        self.log_to_console(f"Final cleanup: killing remaining process {final_check_pid}")
+                        self.kill_process_on_port(final_check_pid)
+                        time.sleep(1)
+                    self.wait_for_finishing_schedulers(10)
+                
+                self.log_to_console("Application shutdown complete")
             
             if self.icon:
                 self.icon.stop()
@@ -530,6 +1282,8 @@ class PySideTodoAppLauncher(QMainWindow):
 
 def main():
     """Main function"""
+    # Required by QtWebEngine when it is used for the app window
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)  # Keep app running when window is hidden
     
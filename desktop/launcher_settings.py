@@ -0,0 +1,98 @@
+"""
+Settings for the Todo App desktop launcher
+Defaults live here and can be overridden by a launcher_settings.json file next to this script
+"""
+import json
+import os
+
+LAUNCHER_DIR = os.path.dirname(os.path.abspath(__file__))
+SETTINGS_FILE = os.path.join(LAUNCHER_DIR, "launcher_settings.json")
+DATA_DIR = os.path.join(LAUNCHER_DIR, "launcher_data")
+
+DEFAULT_SETTINGS = {
+    # Server process (server_command may contain {port}; None runs the Next.js server with npm)
+    "server_command": None,
+    "server_start_timeout_seconds": 60,
+    # Keep a healthy server of the same build left running by a previous launcher
+    "adopt_existing_server": True,
+    # Executable file names of the server, matched instead of the process title Next.js sets
+    "server_process_names": ["node", "node.exe"],
+    # Internal server ports used when the launcher forwards the app port (recycling or on-demand mode)
+    "backend_ports": [8088, 8089],
+    # On-demand mode: start the server on the first request and stop it again when idle.
+    # With maintenance enabled, the hourly reminder check (and the daily backup) start a suspended
+    # server, so it wakes at least once an hour and then stays up for on_demand_idle_minutes
+    "on_demand_enabled": False,
+    "on_demand_idle_minutes": 15,
+    "on_demand_start_timeout_seconds": 120,
+    # Embedded app window (needs PySide6 QtWebEngine) instead of the default browser
+    "app_window_mode": False,
+    "app_window_show_on_start": True,
+    "app_window_cache_mb": 256,
+    # Latency probe
+    "probe_interval_seconds": 5,
+    "probe_timeout_seconds": 5,
+    "probe_health_route": "/api/health",
+    "probe_db_route": "/api/priorities",
+    "probe_window_seconds": 300,
+    "probe_slot_seconds": 30,
+    "probe_p99_threshold_ms": 1000,
+    # Off-peak maintenance jobs (the launcher then also owns the hourly reminder check)
+    "maintenance_enabled": True,
+    "maintenance_max_cpu_percent": 50,
+    "maintenance_max_p99_ms": 500,
+    "maintenance_postpone_seconds": 600,
+    "maintenance_max_postpone_seconds": 21600,
+    "maintenance_reminder_interval_seconds": 3600,
+    "maintenance_vacuum_hour": 3,
+    "maintenance_backup_hour": 4,
+    "maintenance_backup_keep": 7,
+    "psql_path": "psql",
+    # Attachment store (content-addressed uploads and orphan sweep, run daily by the scheduler)
+    "storage_hour": 5,
+    "storage_gc_grace_seconds": 86400,
+    "storage_gc_batch_size": 200,
+    "storage_gc_max_files": 5000,
+    # Prisma query capture (the server appends query events to a file, the launcher aggregates them by statement)
+    "query_capture_enabled": True,
+    "query_events_max_mb": 16,
+    "query_stats_max_statements": 500,
+    "query_stats_export_interval_seconds": 60,
+    # Runtime flag tuner (python runtime_tuner.py); its best configuration is applied on every start
+    "tuning_apply": True,
+    "tuning_port": 8090,
+    "tuning_user_id": None,
+    "tuning_duration_seconds": 30,
+    "tuning_warmup_seconds": 5,
+    "tuning_concurrency": 8,
+    # Interleaved runs per configuration; flags replace Node's defaults only when better beyond their spread
+    "tuning_repeats": 3,
+    "tuning_heap_sizes_mb": [512, 768],
+    "tuning_semi_space_sizes_mb": [16, 64],
+    "tuning_threadpool_sizes": [4, 8],
+    # Lifecycle traces kept in launcher_data/lifecycle_traces.jsonl
+    "trace_max_traces": 200,
+    # Memory-based recycling, off by default: with a ceiling (e.g. 1024) the server runs behind the
+    # launcher's TCP proxy, which adds a hop to every request; 0 runs it directly on the app port
+    "recycle_rss_ceiling_mb": 0,
+    "recycle_heap_fraction": 0.75,
+    "recycle_check_interval_seconds": 30,
+    "recycle_health_timeout_seconds": 120,
+    "recycle_drain_timeout_seconds": 30,
+    "recycle_cooldown_seconds": 600,
+}
+
+
+def load_settings(path=SETTINGS_FILE):
+    """Load launcher settings, falling back to the defaults for missing keys"""
+    settings = dict(DEFAULT_SETTINGS)
+    if not os.path.exists(path):
+        return settings
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            overrides = json.load(f)
+        if isinstance(overrides, dict):
+            settings.update(overrides)
+    except Exception as e:
+        print(f"Error loading launcher settings from {path}: {e}")
+    return settings
@@ -0,0 +1,197 @@
+"""
+Lifecycle phase tracing for the Todo App launcher
+Records server start, stop, quit, suspend and recycle as trees of timed spans, keeps a bounded history on disk
+and exports it in the Chrome trace-event format (chrome://tracing, Perfetto, speedscope)
+
+Usage: python lifecycle_trace.py [list|export] [--name start] [--last 20] [-o trace.json]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from launcher_settings import DATA_DIR
+
+TRACE_FILE = os.path.join(DATA_DIR, "lifecycle_traces.jsonl")
+# Root spans of the launcher lifecycles
+TRACE_NAMES = ("start", "stop", "quit", "suspend", "recycle", "arm")
+
+
+class TraceLog:
+    """JSON lines file of finished traces holding at most max_traces of them"""
+
+    def __init__(self, path=TRACE_FILE, max_traces=200):
+        self.path = path
+        self.max_traces = max_traces
+        self._count = None
+        self.lock = threading.Lock()
+
+    def append(self, trace):
+        with self.lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                if self._count is None:
+                    self._count = len(self._read_lines())
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(trace) + "\n")
+                self._count += 1
+                # Trim only once the file holds twice the limit, so appends stay cheap
+                if self._count >= 2 * self.max_traces:
+                    lines = self._read_lines()[-self.max_traces:]
+                    with open(self.path, "w", encoding="utf-8") as f:
+                        f.writelines(lines)
+                    self._count = len(lines)
+            except OSError as e:
+                print(f"Error writing trace log {self.path}: {e}")
+
+    def _read_lines(self):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "r", encoding="utf-8") as f:
+            return [line for line in f if line.strip()]
+
+    def read(self, name=None, limit=None):
+        """Finished traces, oldest first, optionally only those with a given root span name"""
+        traces = [json.loads(line) for line in self._read_lines()]
+        if name:
+            traces = [t for t in traces if t["name"] == name]
+        return traces[-limit:] if limit else traces
+
+
+class Span:
+    def __init__(self, span_id, parent, name, args):
+        self.id = span_id
+        self.parent = parent
+        self.name = name
+        self.args = args
+        self.start = time.perf_counter()
+        self.duration = None
+
+
+class Tracer:
+    """Creates nested spans per thread; a span without a parent starts a new trace
+
+    With root_names, a parentless span of any other name (a helper such as free_port called
+    outside a lifecycle) is timed but not kept, so it cannot push real traces out of the log.
+    """
+
+    def __init__(self, log=None, keep_recent=20, root_names=None):
+        self.log = log
+        self.root_names = root_names
+        self.recent = deque(maxlen=keep_recent)
+        self._local = threading.local()
+
+    @contextmanager
+    def span(self, name, **args):
+        """Time the enclosed block as a child of the innermost open span on this thread"""
+        state = self._local
+        if not getattr(state, "stack", None):
+            state.stack = []
+            state.spans = []
+            state.started = time.time()
+        parent = state.stack[-1].id if state.stack else None
+        span = Span(len(state.spans), parent, name, args)
+        state.spans.append(span)
+        state.stack.append(span)
+        try:
+            yield span
+        except Exception as e:
+            span.args["error"] = str(e)
+            raise
+        finally:
+            span.duration = time.perf_counter() - span.start
+            state.stack.pop()
+            if not state.stack:
+                self._finish(state.spans, state.started)
+
+    def _finish(self, spans, started):
+        root = spans[0]
+        if self.root_names and root.name not in self.root_names:
+            return
+        trace = {
+            "name": root.name,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started)),
+            "duration_ms": round(root.duration * 1000, 3),
+            "spans": [
+                {
+                    "id": s.id,
+                    "parent": s.parent,
+                    "name": s.name,
+                    "start_ms": round((s.start - root.start) * 1000, 3),
+                    "duration_ms": round(s.duration * 1000, 3),
+                    "args": s.args,
+                }
+                for s in spans
+            ],
+        }
+        self.recent.append(trace)
+        if self.log:
+            self.log.append(trace)
+
+    def last(self, name):
+        """Most recent finished trace with the given root span name, or None"""
+        for trace in reversed(self.recent):
+            if trace["name"] == name:
+                return trace
+        return None
+
+
+def slowest_phase(trace):
+    """Direct child of the root span that took longest, or None"""
+    children = [s for s in trace["spans"] if s["parent"] == 0]
+    return max(children, key=lambda s: s["duration_ms"]) if children else None
+
+
+def to_chrome_trace(traces):
+    """Chrome trace-event JSON with every trace in its own lane, all starting at time 0"""
+    events = []
+    for lane, trace in enumerate(traces, start=1):
+        events.append({
+            "name": "process_name", "ph": "M", "pid": lane, "tid": 1,
+            "args": {"name": f"{trace['name']} {trace['started']} ({trace['duration_ms'] / 1000:.1f}s)"},
+        })
+        events.append({"name": "process_sort_index", "ph": "M", "pid": lane, "tid": 1, "args": {"sort_index": lane}})
+        for span in trace["spans"]:
+            events.append({
+                "name": span["name"],
+                "cat": trace["name"],
+                "ph": "X",
+                "ts": round(span["start_ms"] * 1000),
+                "dur": max(1, round(span["duration_ms"] * 1000)),
+                "pid": lane,
+                "tid": 1,
+                "args": dict(span["args"], span_id=span["id"], parent_id=span["parent"]),
+            })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["list", "export"], nargs="?", default="list")
+    parser.add_argument("--name", choices=TRACE_NAMES, help="only traces of this kind")
+    parser.add_argument("--last", type=int, default=20, help="number of most recent traces")
+    parser.add_argument("-o", "--output", default="lifecycle_trace.json", help="file written by export")
+    args = parser.parse_args(argv)
+
+    traces = TraceLog().read(args.name, args.last)
+    if not traces:
+        print("No lifecycle traces recorded yet")
+        return 1
+    if args.command == "export":
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(to_chrome_trace(traces), f)
+        print(f"Wrote {len(traces)} traces to {args.output}; open it in chrome://tracing or ui.perfetto.dev")
+        return 0
+    for trace in traces:
+        phase = slowest_phase(trace)
+        slowest = f"  slowest: {phase['name']} {phase['duration_ms'] / 1000:.2f}s" if phase else ""
+        print(f"{trace['started']}  {trace['name']:<8}{trace['duration_ms'] / 1000:>8.2f}s{slowest}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
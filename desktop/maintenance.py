@@ -0,0 +1,289 @@
+"""
+Off-peak maintenance scheduler for the Todo App launcher
+Runs periodic jobs against the local server and database from a single deadline-ordered timer,
+postponing them while the machine or the server is busy
+"""
+import datetime
+import heapq
+import json
+import os
+import subprocess
+import threading
+import time
+import urllib.request
+
+import psutil
+from PySide6.QtCore import QThread, Signal
+
+
+def read_env_file(path):
+    """Parse KEY=VALUE lines of a .env file"""
+    values = {}
+    if not os.path.exists(path):
+        return values
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            values[key.strip()] = value.strip().strip('"').strip("'")
+    return values
+
+
+def check_reminders(base_url):
+    """Ask the server to send Telegram reminders for overdue tasks"""
+    request = urllib.request.Request(
+        f"{base_url}/api/telegram",
+        data=json.dumps({"action": "check-reminders"}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=300) as response:
+        response.read()
+    return "reminder check completed"
+
+
+def project_database_url(project_root):
+    """DATABASE_URL from the environment or the project .env file"""
+    return os.environ.get("DATABASE_URL") or read_env_file(os.path.join(project_root, ".env")).get("DATABASE_URL")
+
+
+def hidden_window_kwargs():
+    """subprocess arguments that keep console windows hidden on Windows"""
+    return {"creationflags": subprocess.CREATE_NO_WINDOW} if os.name == "nt" else {}
+
+
+class JobCancelled(RuntimeError):
+    """Raised inside a job whose scheduler was stopped while it was running"""
+
+
+def kill_process_tree(process):
+    """Kill a child process and everything it started"""
+    try:
+        children = psutil.Process(process.pid).children(recursive=True)
+    except psutil.Error:
+        children = []
+    for child in children:
+        try:
+            child.kill()
+        except psutil.Error:
+            pass
+    process.kill()
+
+
+def run_process(command, timeout, cancel=None, **kwargs):
+    """subprocess.run with captured output that kills the child as soon as cancel is set"""
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs) as process:
+        deadline = time.time() + timeout
+        while True:
+            try:
+                stdout, stderr = process.communicate(timeout=0.25)
+                break
+            except subprocess.TimeoutExpired:
+                cancelled = cancel is not None and cancel.is_set()
+                if cancelled or time.time() >= deadline:
+                    kill_process_tree(process)
+                    process.communicate()
+                    if cancelled:
+                        raise JobCancelled("cancelled")
+                    raise subprocess.TimeoutExpired(command, timeout)
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+
+def run_psql(database_url, args, psql="psql", timeout=3600, cancel=None):
+    """Run psql against the app database and return its stdout"""
+    if not database_url:
+        raise RuntimeError("DATABASE_URL is not set")
+    # Prisma-only query parameters such as ?schema= are not understood by libpq
+    connection = database_url.split("?", 1)[0]
+    # Options only: psql builds that stop parsing at the first positional argument would
+    # otherwise ignore -c/-f and wait for input; stdin is closed for the same reason
+    result = run_process(
+        [psql, "-d", connection, "-w", "-v", "ON_ERROR_STOP=1", *args], timeout, cancel,
+        stdin=subprocess.DEVNULL, text=True, encoding="utf-8", **hidden_window_kwargs()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"psql exited with {result.returncode}")
+    return result.stdout
+
+
+def vacuum_analyze(database_url, psql="psql", cancel=None):
+    """Run VACUUM ANALYZE on the app database"""
+    run_psql(database_url, ["-c", "VACUUM (ANALYZE)"], psql, cancel=cancel)
+    return "vacuum analyze completed"
+
+
+def backup_database(base_url, backup_dir, keep=7, cancel=None):
+    """Save a JSON backup from /api/backup and keep only the newest files"""
+    os.makedirs(backup_dir, exist_ok=True)
+    path = os.path.join(backup_dir, f"taskpro-backup-{time.strftime('%Y-%m-%d_%H%M%S')}.json")
+    with urllib.request.urlopen(f"{base_url}/api/backup", timeout=600) as response, open(path, "wb") as f:
+        while True:
+            if cancel is not None and cancel.is_set():
+                break
+            chunk = response.read(1024 * 1024)
+            if not chunk:
+                break
+            f.write(chunk)
+    if cancel is not None and cancel.is_set():
+        os.remove(path)
+        raise JobCancelled("cancelled")
+    backups = sorted(name for name in os.listdir(backup_dir) if name.startswith("taskpro-backup-"))
+    for name in backups[:-keep] if keep > 0 else []:
+        os.remove(os.path.join(backup_dir, name))
+    return f"saved {os.path.basename(path)} ({os.path.getsize(path) // 1024} KB)"
+
+
+class MaintenanceJob:
+    """A periodic job; preferred_hour pins daily jobs to an off-peak hour"""
+
+    def __init__(self, name, action, interval_seconds, preferred_hour=None, deferrable=True, requires_server=True):
+        self.name = name
+        self.action = action
+        self.interval = interval_seconds
+        self.preferred_hour = preferred_hour
+        self.deferrable = deferrable
+        self.requires_server = requires_server
+        self.due_since = None
+
+    def first_run(self, now):
+        """Timestamp of the first run after now"""
+        if self.preferred_hour is not None:
+            today = datetime.datetime.fromtimestamp(now).replace(
+                hour=self.preferred_hour, minute=0, second=0, microsecond=0
+            )
+            first = today if today.timestamp() > now else today + datetime.timedelta(days=1)
+            return first.timestamp()
+        # Align to the interval so hourly jobs run on the hour
+        return (now // self.interval + 1) * self.interval
+
+    def next_run(self, scheduled):
+        """Timestamp of the next regular run after the one scheduled at the given time"""
+        return scheduled + self.interval
+
+
+class JobHistory:
+    """Per-job run history, kept in memory and appended to a JSON lines file"""
+
+    def __init__(self, path, keep=20):
+        self.path = path
+        self.keep = keep
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def record(self, job, status, scheduled, started=None, duration=None, detail=""):
+        entry = {
+            "job": job,
+            "status": status,
+            "scheduled": datetime.datetime.fromtimestamp(scheduled).isoformat(timespec="seconds"),
+            "started": datetime.datetime.fromtimestamp(started).isoformat(timespec="seconds") if started else None,
+            "duration_seconds": round(duration, 2) if duration is not None else None,
+            "detail": detail,
+        }
+        with self.lock:
+            runs = self.entries.setdefault(job, [])
+            runs.append(entry)
+            del runs[:-self.keep]
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"Error writing maintenance history: {e}")
+        return entry
+
+    def last(self, job):
+        with self.lock:
+            runs = self.entries.get(job)
+            return runs[-1] if runs else None
+
+
+class MaintenanceScheduler(QThread):
+    """Thread running maintenance jobs at their deadlines
+
+    All jobs share one heap ordered by deadline and the thread sleeps until the earliest
+    one, so nothing is polled between runs. Jobs given stop_event as their cancel event
+    end early when the scheduler is stopped.
+    """
+    log_message = Signal(str)
+
+    def __init__(self, jobs, history, busy_reason, server_running, postpone_seconds=600, max_postpone_seconds=21600,
+                 stop_event=None):
+        super().__init__()
+        self.jobs = jobs
+        self.history = history
+        self.busy_reason = busy_reason
+        self.server_running = server_running
+        self.postpone_seconds = postpone_seconds
+        self.max_postpone_seconds = max_postpone_seconds
+        self._stop_event = stop_event or threading.Event()
+        self._heap = []
+
+    def run(self):
+        """Wait for each deadline in turn until stopped"""
+        now = time.time()
+        self._heap = [(job.first_run(now), index, job) for index, job in enumerate(self.jobs)]
+        heapq.heapify(self._heap)
+        while self._heap and not self._stop_event.is_set():
+            deadline, index, job = self._heap[0]
+            if self._stop_event.wait(max(0.0, deadline - time.time())):
+                break
+            heapq.heappop(self._heap)
+            heapq.heappush(self._heap, (self.execute(job, deadline), index, job))
+
+    def execute(self, job, deadline):
+        """Run, postpone or skip a due job and return its next deadline"""
+        scheduled = job.due_since or deadline
+        if job.requires_server and not self.server_running():
+            job.due_since = None
+            self.history.record(job.name, "skipped", scheduled, detail="server not running")
+            return self.next_after(job, scheduled)
+
+        if job.deferrable:
+            reason = self.busy_reason()
+            if reason:
+                if time.time() - scheduled + self.postpone_seconds <= self.max_postpone_seconds:
+                    job.due_since = scheduled
+                    self.history.record(job.name, "postponed", scheduled, detail=reason)
+                    return time.time() + self.postpone_seconds
+                job.due_since = None
+                self.log_message.emit(f"Maintenance job '{job.name}' skipped: {reason}")
+                self.history.record(job.name, "skipped", scheduled, detail=reason)
+                return self.next_after(job, scheduled)
+
+        job.due_since = None
+        started = time.time()
+        try:
+            detail = job.action() or ""
+            duration = time.time() - started
+            self.log_message.emit(f"✓ Maintenance job '{job.name}' finished in {duration:.1f}s")
+            self.history.record(job.name, "ok", scheduled, started, duration, detail)
+        except JobCancelled:
+            duration = time.time() - started
+            self.log_message.emit(f"Maintenance job '{job.name}' cancelled")
+            self.history.record(job.name, "cancelled", scheduled, started, duration)
+        except Exception as e:
+            duration = time.time() - started
+            self.log_message.emit(f"✗ Maintenance job '{job.name}' failed: {e}")
+            self.history.record(job.name, "failed", scheduled, started, duration, str(e))
+        return self.next_after(job, scheduled)
+
+    def next_after(self, job, scheduled):
+        """Next regular deadline that is still in the future"""
+        deadline = job.next_run(scheduled)
+        now = time.time()
+        while deadline <= now:
+            deadline = job.next_run(deadline)
+        return deadline
+
+    def stop(self, timeout=None):
+        """Ask the scheduler to exit and cancel the running job
+
+        Waits at most timeout seconds (without a timeout until the job ends) and returns
+        whether the thread has finished.
+        """
+        self._stop_event.set()
+        if timeout is None:
+            return self.wait()
+        return self.wait(int(timeout * 1000))
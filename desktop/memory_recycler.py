@@ -0,0 +1,94 @@
+"""
+Memory watchdog for the Todo App server
+Samples the RSS of the server process tree and reports when it grows past the configured ceiling
+"""
+import json
+import os
+import threading
+import time
+
+import psutil
+from PySide6.QtCore import QThread, Signal
+
+
+def process_tree_rss(pid):
+    """Total resident memory in bytes of a process and all of its children"""
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return 0
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+def heap_limit_mb(ceiling_mb, heap_fraction=0.75):
+    """V8 old space size in MB that keeps the heap below the RSS ceiling, None without a ceiling"""
+    if not ceiling_mb or ceiling_mb <= 0:
+        return None
+    return max(64, int(ceiling_mb * heap_fraction))
+
+
+def merge_node_options(existing, extra):
+    """Append flags to an existing NODE_OPTIONS value"""
+    return " ".join(part for part in (existing or "", extra) if part).strip()
+
+
+class EventLog:
+    """Append-only JSON lines log of launcher events such as recycles"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def record(self, event, **details):
+        entry = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "event": event}
+        entry.update(details)
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"Error writing event log {self.path}: {e}")
+        return entry
+
+    def read(self, limit=None):
+        """Return the recorded events, oldest first"""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "r", encoding="utf-8") as f:
+            events = [json.loads(line) for line in f if line.strip()]
+        return events[-limit:] if limit else events
+
+
+class MemoryWatchdog(QThread):
+    """Thread that watches the server process tree RSS against a ceiling"""
+    rss_sampled = Signal(float)
+    ceiling_exceeded = Signal(float)
+
+    def __init__(self, get_root_pid, ceiling_mb, interval_seconds=30):
+        super().__init__()
+        self.get_root_pid = get_root_pid
+        self.ceiling_mb = ceiling_mb
+        self.interval = interval_seconds
+        self._stop_event = threading.Event()
+
+    def run(self):
+        """Sample memory until stopped"""
+        while not self._stop_event.wait(self.interval):
+            pid = self.get_root_pid()
+            if not pid:
+                continue
+            rss_mb = process_tree_rss(pid) / (1024 * 1024)
+            self.rss_sampled.emit(rss_mb)
+            if rss_mb > self.ceiling_mb:
+                self.ceiling_exceeded.emit(rss_mb)
+
+    def stop(self):
+        """Ask the watchdog loop to exit and wait for it"""
+        self._stop_event.set()
+        self.wait()
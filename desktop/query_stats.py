@@ -0,0 +1,256 @@
+"""
+Prisma query statistics for the Todo App server
+Tails the query events the server appends to the file named by PRISMA_QUERY_EVENTS_FILE and
+aggregates them by normalized SQL statement and by Prisma operation
+
+Usage: python query_stats.py [--by total|p99|count] [--limit 20]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+from latency_probe import LatencyHistogram
+from launcher_settings import DATA_DIR
+
+EXPORT_FILE = os.path.join(DATA_DIR, "query_stats.json")
+EVENTS_FILE = os.path.join(DATA_DIR, "query_events.log")
+STATEMENT_EVENT = "prisma:query-event "
+OPERATION_EVENT = "prisma:operation-event "
+OTHER_STATEMENTS = "(other statements)"
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMETER = re.compile(r"\$\d+")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_statement(sql):
+    """SQL with literals and parameters replaced by ? and IN lists collapsed"""
+    sql = _STRING.sub("?", sql)
+    sql = _PARAMETER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _LIST.sub("(...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+class _Aggregate:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.rows = 0
+        self.histogram = LatencyHistogram(significant_digits=2)
+
+    def record(self, duration_ms, rows=0):
+        self.count += 1
+        self.total_ms += duration_ms
+        self.rows += rows
+        self.histogram.record(duration_ms)
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 1),
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else None,
+            "p99_ms": self.histogram.percentile(99),
+            "max_ms": self.histogram.max_value / 1000.0,
+        }
+
+
+class QueryStats:
+    """Thread-safe aggregation of query events with a bounded number of distinct statements"""
+
+    def __init__(self, max_statements=500):
+        self.max_statements = max_statements
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.since = time.strftime("%Y-%m-%dT%H:%M:%S")
+            self.statements = {}
+            self.operations = {}
+            # Prisma repeats the same SQL text, so normalize each distinct text only once
+            self._normalized = {}
+
+    def _statement_key(self, sql):
+        key = self._normalized.get(sql)
+        if key is None:
+            key = normalize_statement(sql)
+            if len(self._normalized) < self.max_statements * 4:
+                self._normalized[sql] = key
+        if key not in self.statements and len(self.statements) >= self.max_statements:
+            key = OTHER_STATEMENTS
+        return key
+
+    def record_statement(self, sql, duration_ms):
+        with self.lock:
+            key = self._statement_key(sql)
+            self.statements.setdefault(key, _Aggregate()).record(duration_ms)
+
+    def record_operation(self, model, operation, duration_ms, rows):
+        with self.lock:
+            key = f"{model}.{operation}" if model else operation
+            self.operations.setdefault(key, _Aggregate()).record(duration_ms, rows)
+
+    def parse_line(self, line):
+        """Record the event on a line of the event file; False when it is not a query event"""
+        try:
+            if line.startswith(STATEMENT_EVENT):
+                event = json.loads(line[len(STATEMENT_EVENT):])
+                self.record_statement(event["query"], float(event["durationMs"]))
+                return True
+            if line.startswith(OPERATION_EVENT):
+                event = json.loads(line[len(OPERATION_EVENT):])
+                self.record_operation(
+                    event.get("model"), event["operation"], float(event["durationMs"]), int(event.get("rows") or 0)
+                )
+                return True
+        except (ValueError, KeyError, TypeError):
+            return True
+        return False
+
+    def top(self, by="total", limit=10):
+        """Statements ranked by total time, p99 or count, slowest first"""
+        with self.lock:
+            rows = [dict(statement=key, **aggregate.summary()) for key, aggregate in self.statements.items()]
+        return sorted(rows, key=lambda r: r[f"{by}_ms" if by != "count" else "count"] or 0, reverse=True)[:limit]
+
+    def top_operations(self, limit=10):
+        """Prisma operations ranked by total time, with the rows they returned"""
+        with self.lock:
+            rows = []
+            for key, aggregate in self.operations.items():
+                summary = aggregate.summary()
+                summary.update(operation=key, rows=aggregate.rows,
+                               mean_rows=round(aggregate.rows / aggregate.count, 1) if aggregate.count else None)
+                rows.append(summary)
+        return sorted(rows, key=lambda r: r["total_ms"], reverse=True)[:limit]
+
+    def snapshot(self, limit=50):
+        return {
+            "since": self.since,
+            "exported": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "statements": self.top("total", limit),
+            "operations": self.top_operations(limit),
+        }
+
+    def export(self, path=EXPORT_FILE, limit=50):
+        """Write the ranked statements and operations to a JSON file"""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(limit), f, indent=2)
+        except OSError as e:
+            print(f"Error writing query stats {path}: {e}")
+
+
+class QueryEventTail:
+    """Follow the query event file in a background thread and record every complete line
+
+    The server appends to the file, so it keeps running whether or not the launcher is alive.
+    Once the file is larger than max_bytes and fully read it is truncated; the server opened it
+    in append mode, so its next write lands at the new end. A line written in between is lost.
+    """
+
+    def __init__(self, path, stats, max_bytes=16 * 1024 * 1024, interval_seconds=1.0):
+        self.path = path
+        self.stats = stats
+        self.max_bytes = max_bytes
+        self.interval = interval_seconds
+        self.position = None
+        self.partial = b""
+        self._stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Start following from the current end of the file"""
+        try:
+            self.position = os.path.getsize(self.path)
+        except OSError:
+            self.position = 0
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def stop(self):
+        """Read what is left and stop following"""
+        self._stop_event.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+        if self.position is not None:
+            self.read_new()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.read_new()
+
+    def read_new(self):
+        """Record the lines appended since the last read; return how many were read"""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return 0
+        if size < self.position:
+            # Truncated by another launcher: start over
+            self.position = 0
+            self.partial = b""
+        if size == self.position:
+            return 0
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self.position)
+                data = f.read(size - self.position)
+                self.position += len(data)
+                if self.position >= self.max_bytes and f.seek(0, os.SEEK_END) == self.position:
+                    with open(self.path, "r+b") as writer:
+                        writer.truncate(0)
+                    self.position = 0
+        except OSError:
+            return 0
+        lines = (self.partial + data).split(b"\n")
+        self.partial = lines.pop()
+        for line in lines:
+            self.stats.parse_line(line.decode("utf-8", errors="replace"))
+        return len(lines)
+
+
+def print_ranking(snapshot, by="total", limit=20):
+    key = {"total": "total_ms", "p99": "p99_ms", "count": "count"}[by]
+    statements = sorted(snapshot["statements"], key=lambda r: r[key] or 0, reverse=True)[:limit]
+    print(f"Queries since {snapshot['since']}, exported {snapshot['exported']}")
+    print(f"{'count':>8}{'total ms':>11}{'p99 ms':>9}  statement")
+    for row in statements:
+        p99 = f"{row['p99_ms']:.1f}" if row["p99_ms"] is not None else "-"
+        print(f"{row['count']:>8}{row['total_ms']:>11.0f}{p99:>9}  {row['statement'][:160]}")
+    print()
+    print(f"{'count':>8}{'total ms':>11}{'p99 ms':>9}{'rows/op':>9}  operation")
+    for row in snapshot["operations"][:limit]:
+        p99 = f"{row['p99_ms']:.1f}" if row["p99_ms"] is not None else "-"
+        print(f"{row['count']:>8}{row['total_ms']:>11.0f}{p99:>9}{row['mean_rows']:>9}  {row['operation']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--by", choices=["total", "p99", "count"], default="total", help="ranking order")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(EXPORT_FILE):
+        print("No query stats exported yet; start the server from the launcher with query_capture_enabled")
+        return 1
+    with open(EXPORT_FILE, "r", encoding="utf-8") as f:
+        print_ranking(json.load(f), args.by, args.limit)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
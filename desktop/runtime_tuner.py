@@ -0,0 +1,415 @@
+"""
+Runtime flag tuner for the Todo App server
+Runs a read-heavy task API workload against the server started under several Node runtime
+configurations (old space size, semi-space size, UV_THREADPOOL_SIZE), measures throughput,
+tail latency and RSS, and stores the best configuration for the launcher to apply
+
+Usage: python runtime_tuner.py [--user EMAIL] [--duration 30] [--concurrency 8] [--repeats 3] [--show]
+"""
+import argparse
+import itertools
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import psutil
+
+from latency_probe import LatencyHistogram
+from launcher_settings import DATA_DIR, load_settings
+from maintenance import hidden_window_kwargs
+from memory_recycler import merge_node_options, process_tree_rss
+from server_adoption import fetch_health, read_build_id
+
+RESULTS_FILE = os.path.join(DATA_DIR, "runtime_tuning.json")
+
+# Routes of the standard workload and how often each is requested, roughly what the task board loads
+WORKLOAD = [
+    ("/api/tasks?userId={user}", 6),
+    ("/api/priorities", 2),
+    ("/api/projects?userId={user}", 1),
+    ("/api/health", 1),
+]
+
+
+def candidate_configs(settings):
+    """Node's defaults followed by every combination of the configured flag values"""
+    configs = [{"name": "default"}]
+    for heap, semi_space, threadpool in itertools.product(
+        settings["tuning_heap_sizes_mb"],
+        settings["tuning_semi_space_sizes_mb"],
+        settings["tuning_threadpool_sizes"],
+    ):
+        configs.append({
+            "name": f"heap{heap}-semi{semi_space}-uv{threadpool}",
+            "max_old_space_size_mb": heap,
+            "max_semi_space_size_mb": semi_space,
+            "uv_threadpool_size": threadpool,
+        })
+    return configs
+
+
+def runtime_environment(config, heap_limit=None):
+    """NODE_OPTIONS flags and extra environment variables for a runtime configuration
+
+    heap_limit caps the old space size, so a tuned heap never exceeds what memory recycling allows.
+    """
+    config = config or {}
+    heap = config.get("max_old_space_size_mb")
+    if heap_limit:
+        heap = min(heap or heap_limit, heap_limit)
+    flags = []
+    if heap:
+        flags.append(f"--max-old-space-size={heap}")
+    if config.get("max_semi_space_size_mb"):
+        flags.append(f"--max-semi-space-size={config['max_semi_space_size_mb']}")
+    env = {}
+    if config.get("uv_threadpool_size"):
+        env["UV_THREADPOOL_SIZE"] = str(config["uv_threadpool_size"])
+    return " ".join(flags), env
+
+
+def workload_paths(user):
+    """Request paths of one workload cycle, without the user-specific routes when no user is given"""
+    paths = []
+    for template, weight in WORKLOAD:
+        if "{user}" in template:
+            if not user:
+                continue
+            template = template.replace("{user}", urllib.parse.quote(user))
+        paths += [template] * weight
+    return paths
+
+
+def run_workload(base_url, paths, duration, concurrency, warmup=0, pid=None, timeout=10):
+    """Request paths round-robin from several threads and summarize what the server sustained"""
+    routes = itertools.cycle(paths)
+    lock = threading.Lock()
+    histogram = LatencyHistogram(significant_digits=3)
+    totals = {"requests": 0, "errors": 0, "peak_rss": 0}
+    measure_from = time.time() + warmup
+    deadline = measure_from + duration
+    done = threading.Event()
+
+    def worker():
+        while True:
+            now = time.time()
+            if now >= deadline:
+                return
+            with lock:
+                path = next(routes)
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(base_url + path, timeout=timeout) as response:
+                    response.read()
+                failed = False
+            except (urllib.error.URLError, OSError, ValueError):
+                failed = True
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            if now < measure_from:
+                continue
+            with lock:
+                totals["requests"] += 1
+                if failed:
+                    totals["errors"] += 1
+                else:
+                    histogram.record(elapsed_ms)
+
+    def sample_rss():
+        while not done.wait(0.5):
+            if time.time() >= measure_from:
+                totals["peak_rss"] = max(totals["peak_rss"], process_tree_rss(pid))
+
+    sampler = None
+    if pid:
+        sampler = threading.Thread(target=sample_rss, daemon=True)
+        sampler.start()
+    workers = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    done.set()
+    if sampler:
+        sampler.join()
+    if pid:
+        totals["peak_rss"] = max(totals["peak_rss"], process_tree_rss(pid))
+
+    return {
+        "requests": totals["requests"],
+        "errors": totals["errors"],
+        "throughput_rps": round(totals["requests"] / duration, 1) if duration else 0.0,
+        "p50_ms": histogram.percentile(50),
+        "p99_ms": histogram.percentile(99),
+        "peak_rss_mb": round(totals["peak_rss"] / (1024 * 1024), 1),
+    }
+
+
+def summarize_runs(config, runs):
+    """Result of one configuration from its repeated runs: medians plus the spread between runs"""
+    measured = [r for r in runs if r["requests"] and r["p99_ms"] is not None]
+    if not measured or len(measured) < len(runs):
+        return {"config": config, "requests": sum(r["requests"] for r in runs),
+                "errors": sum(r["errors"] for r in runs), "throughput_rps": 0.0, "p50_ms": None, "p99_ms": None,
+                "peak_rss_mb": None, "throughput_spread_rps": None, "p99_spread_ms": None, "runs": runs,
+                "failed": True}
+    throughput = [r["throughput_rps"] for r in measured]
+    p99 = [r["p99_ms"] for r in measured]
+    return {
+        "config": config,
+        "requests": sum(r["requests"] for r in measured),
+        "errors": sum(r["errors"] for r in measured),
+        "throughput_rps": round(statistics.median(throughput), 1),
+        "p50_ms": statistics.median(r["p50_ms"] for r in measured),
+        "p99_ms": statistics.median(p99),
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in measured),
+        "throughput_spread_rps": round(max(throughput) - min(throughput), 1),
+        "p99_spread_ms": max(p99) - min(p99),
+        "runs": runs,
+    }
+
+
+def beats(result, baseline):
+    """Whether result is better than baseline by more than the run-to-run spread of either
+
+    Better means a higher throughput or a lower p99 beyond the spread, without being worse
+    than the baseline beyond the spread in the other measure.
+    """
+    throughput_margin = max(result.get("throughput_spread_rps") or 0, baseline.get("throughput_spread_rps") or 0)
+    p99_margin = max(result.get("p99_spread_ms") or 0, baseline.get("p99_spread_ms") or 0)
+    faster = result["throughput_rps"] - baseline["throughput_rps"] > throughput_margin
+    slower = baseline["throughput_rps"] - result["throughput_rps"] > throughput_margin
+    lower_tail = baseline["p99_ms"] - result["p99_ms"] > p99_margin
+    higher_tail = result["p99_ms"] - baseline["p99_ms"] > p99_margin
+    return (faster or lower_tail) and not (slower or higher_tail)
+
+
+def choose_best(results, throughput_tolerance=0.05):
+    """Lowest p99, then lowest RSS, among error-free results within tolerance of the best throughput
+
+    Node's defaults are kept unless that result beats them by more than the measured spread,
+    so run-to-run noise never selects a flag combination.
+    """
+    usable = [r for r in results if r["requests"] and not r["errors"] and r["p99_ms"] is not None]
+    if not usable:
+        return None
+    top = max(r["throughput_rps"] for r in usable)
+    contenders = [r for r in usable if r["throughput_rps"] >= top * (1 - throughput_tolerance)]
+    best = min(contenders, key=lambda r: (r["p99_ms"], r["peak_rss_mb"]))
+    default = next((r for r in usable if r["config"]["name"] == "default"), None)
+    if default and best is not default and not beats(best, default):
+        return default
+    return best
+
+
+def node_version():
+    """Version reported by `node --version`, or None when node is not on the PATH"""
+    try:
+        result = subprocess.run(
+            ["node", "--version"], capture_output=True, text=True, timeout=10, **hidden_window_kwargs()
+        )
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def load_results(path=RESULTS_FILE):
+    """The stored tuning report, or None when the tuner has not run"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error reading tuning results {path}: {e}")
+        return None
+
+
+def save_results(report, path=RESULTS_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+def best_config(path=RESULTS_FILE):
+    """Runtime configuration the launcher should apply, or None"""
+    report = load_results(path)
+    if not report or not report.get("best"):
+        return None
+    for result in report.get("results", []):
+        if result["config"]["name"] == report["best"]:
+            return result["config"]
+    return None
+
+
+class RuntimeTuner:
+    """Starts the server once per configuration on a spare port and measures it under the workload"""
+
+    def __init__(self, project_root, settings, log=print):
+        self.project_root = project_root
+        self.settings = settings
+        self.log = log
+        self.port = settings["tuning_port"]
+
+    def server_command(self):
+        if self.settings["server_command"]:
+            return self.settings["server_command"].format(port=self.port)
+        return f"npx next start -p {self.port}"
+
+    def spawn(self, config):
+        env = os.environ.copy()
+        flags, extra_env = runtime_environment(config)
+        if flags:
+            env["NODE_OPTIONS"] = merge_node_options(env.get("NODE_OPTIONS"), flags)
+        env.update(extra_env)
+        # Tuning servers must not send Telegram reminders of their own
+        env["REMINDER_SCHEDULER"] = "launcher"
+        kwargs = {"start_new_session": True} if sys.platform != "win32" else hidden_window_kwargs()
+        return subprocess.Popen(
+            self.server_command(), shell=True, cwd=self.project_root, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **kwargs
+        )
+
+    def wait_until_healthy(self, process):
+        deadline = time.time() + self.settings["server_start_timeout_seconds"]
+        while time.time() < deadline:
+            if process.poll() is not None:
+                return False
+            if fetch_health(self.port, timeout=2):
+                return True
+            time.sleep(0.25)
+        return False
+
+    def stop(self, process):
+        try:
+            root = psutil.Process(process.pid)
+            processes = root.children(recursive=True) + [root]
+        except psutil.Error:
+            return
+        for p in processes:
+            try:
+                p.terminate()
+            except psutil.Error:
+                pass
+        _, alive = psutil.wait_procs(processes, timeout=5)
+        for p in alive:
+            try:
+                p.kill()
+            except psutil.Error:
+                pass
+        psutil.wait_procs(alive, timeout=5)
+
+    def measure(self, config, paths):
+        """Run the workload once against a fresh server started with one configuration"""
+        self.log(f"Measuring {config['name']}...")
+        process = self.spawn(config)
+        try:
+            if not self.wait_until_healthy(process):
+                self.log(f"✗ Server did not start with {config['name']}")
+                return {"requests": 0, "errors": 0, "throughput_rps": 0.0,
+                        "p50_ms": None, "p99_ms": None, "peak_rss_mb": None, "failed": True}
+            stats = run_workload(
+                f"http://127.0.0.1:{self.port}",
+                paths,
+                self.settings["tuning_duration_seconds"],
+                self.settings["tuning_concurrency"],
+                warmup=self.settings["tuning_warmup_seconds"],
+                pid=process.pid,
+            )
+        finally:
+            self.stop(process)
+        return stats
+
+    def run(self, configs=None):
+        """Measure every configuration repeatedly and return the report with the best one marked
+
+        The repeats are interleaved (every configuration once, then again), so drift of the
+        machine over the session spreads across all configurations instead of favouring one.
+        """
+        user = self.settings["tuning_user_id"]
+        if not user:
+            self.log("No tuning_user_id set, the workload skips the task and project lists")
+        paths = workload_paths(user)
+        configs = configs or candidate_configs(self.settings)
+        repeats = max(1, self.settings["tuning_repeats"])
+        runs = {config["name"]: [] for config in configs}
+        for round_number in range(1, repeats + 1):
+            self.log(f"Round {round_number} of {repeats}")
+            for config in configs:
+                runs[config["name"]].append(self.measure(config, paths))
+        results = [summarize_runs(config, runs[config["name"]]) for config in configs]
+        best = choose_best(results)
+        return {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "node_version": node_version(),
+            "build_id": read_build_id(self.project_root),
+            "workload": {
+                "paths": sorted(set(paths)),
+                "duration_seconds": self.settings["tuning_duration_seconds"],
+                "concurrency": self.settings["tuning_concurrency"],
+                "repeats": repeats,
+            },
+            "results": results,
+            "best": best["config"]["name"] if best else None,
+        }
+
+
+def print_report(report):
+    print(f"Tuned {report['time']} with Node {report.get('node_version') or 'unknown'}, build {report.get('build_id') or 'unknown'}")
+    print(f"Medians of {report['workload'].get('repeats', 1)} runs per configuration, ± the spread between runs")
+    print(f"{'config':<24}{'req/s':>9}{'±':>6}{'p50 ms':>9}{'p99 ms':>9}{'±':>7}{'RSS MB':>9}{'errors':>8}")
+    for result in report["results"]:
+        marker = " *" if result["config"]["name"] == report.get("best") else ""
+        p50 = f"{result['p50_ms']:.1f}" if result["p50_ms"] is not None else "-"
+        p99 = f"{result['p99_ms']:.1f}" if result["p99_ms"] is not None else "-"
+        rps_spread = f"{result['throughput_spread_rps']:.1f}" if result.get("throughput_spread_rps") is not None else "-"
+        p99_spread = f"{result['p99_spread_ms']:.1f}" if result.get("p99_spread_ms") is not None else "-"
+        rss = f"{result['peak_rss_mb']:.0f}" if result["peak_rss_mb"] is not None else "-"
+        print(f"{result['config']['name']:<24}{result['throughput_rps']:>9.1f}{rps_spread:>6}{p50:>9}{p99:>9}"
+              f"{p99_spread:>7}{rss:>9}{result['errors']:>8}{marker}")
+    if not report.get("best"):
+        print("✗ No configuration completed the workload without errors")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user", help="email or id of the user whose tasks the workload reads")
+    parser.add_argument("--duration", type=float, help="seconds to measure each configuration")
+    parser.add_argument("--concurrency", type=int, help="parallel requests")
+    parser.add_argument("--repeats", type=int, help="runs per configuration")
+    parser.add_argument("--show", action="store_true", help="print the stored results without tuning")
+    args = parser.parse_args(argv)
+
+    if args.show:
+        report = load_results()
+        if not report:
+            print("The tuner has not been run yet")
+            return 1
+        print_report(report)
+        return 0
+
+    settings = load_settings()
+    if args.user:
+        settings["tuning_user_id"] = args.user
+    if args.duration:
+        settings["tuning_duration_seconds"] = args.duration
+    if args.concurrency:
+        settings["tuning_concurrency"] = args.concurrency
+    if args.repeats:
+        settings["tuning_repeats"] = args.repeats
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    report = RuntimeTuner(project_root, settings).run()
+    save_results(report)
+    print_report(report)
+    return 0 if report["best"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Adoption of an already-running Todo App server
+Lets the launcher supervise a healthy server left behind by a previous launcher instead of restarting it
+"""
+import json
+import os
+import subprocess
+import urllib.request
+
+import psutil
+
+
+def read_build_id(project_root):
+    """Build id of the current Next.js build, or None when there is no build"""
+    try:
+        with open(os.path.join(project_root, ".next", "BUILD_ID"), "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def fetch_health(port, timeout=3):
+    """JSON body of /api/health on a port, or None when it does not answer"""
+    try:
+        with urllib.request.urlopen(f'http://localhost:{port}/api/health', timeout=timeout) as response:
+            if response.status != 200:
+                return None
+            return json.loads(response.read().decode("utf-8"))
+    except Exception:
+        return None
+
+
+def same_path(first, second):
+    return os.path.normcase(os.path.realpath(first)) == os.path.normcase(os.path.realpath(second))
+
+
+def executable_name(process):
+    """Lower-case file name of a process executable
+
+    Matches on the executable rather than name(), which reports the process title on POSIX
+    (Next.js renames node to "next-server (vX.Y.Z)"). Falls back to name() when the path is hidden.
+    """
+    try:
+        exe = process.exe()
+    except (psutil.Error, OSError):
+        exe = ""
+    return os.path.basename(exe).lower() if exe else process.name().lower()
+
+
+def is_project_process(pid, project_root, process_names):
+    """Whether pid is a server process started from this project"""
+    try:
+        process = psutil.Process(pid)
+        names = [name.lower() for name in process_names]
+        return executable_name(process) in names and same_path(process.cwd(), project_root)
+    except (psutil.Error, OSError):
+        return False
+
+
+class AdoptedProcess:
+    """Popen-like handle for a server process the launcher did not start itself"""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.process = psutil.Process(pid)
+        self.returncode = None
+
+    def poll(self):
+        if self.returncode is None and not self.process.is_running():
+            self.returncode = 0
+        return self.returncode
+
+    def wait(self, timeout=None):
+        try:
+            self.returncode = self.process.wait(timeout) or 0
+        except psutil.TimeoutExpired:
+            raise subprocess.TimeoutExpired(f"PID {self.pid}", timeout)
+        except psutil.NoSuchProcess:
+            self.returncode = 0
+        return self.returncode
+
+    def terminate(self):
+        try:
+            self.process.terminate()
+        except psutil.NoSuchProcess:
+            pass
+
+    def kill(self):
+        try:
+            self.process.kill()
+        except psutil.NoSuchProcess:
+            pass
@@ -0,0 +1,159 @@
+"""
+Small TCP forwarder for the Todo App launcher
+Owns the public port and forwards every connection to the current backend server port,
+so the backend can be swapped, or started on the first request, without closing the public port
+"""
+import socket
+import threading
+import time
+
+
+class TcpProxy:
+    """Forward connections from a public port to a switchable backend port
+
+    Without a backend port, connections are held until one is set. The first held
+    connection calls on_activate so the owner can start a backend, and on_cold_start
+    receives how long that connection waited.
+    """
+
+    def __init__(self, listen_port, backend_port=None, backend_host="127.0.0.1",
+                 on_activate=None, on_cold_start=None, activation_timeout=120):
+        self.listen_port = listen_port
+        self.backend_port = backend_port
+        self.backend_host = backend_host
+        self.on_activate = on_activate
+        self.on_cold_start = on_cold_start
+        self.activation_timeout = activation_timeout
+        self.server_socket = None
+        self.running = False
+        self.connections = {}
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.activating = False
+        self.last_activity = time.time()
+        if backend_port is not None:
+            self.ready.set()
+
+    def start(self):
+        """Bind the public port and start accepting connections"""
+        if socket.has_dualstack_ipv6():
+            self.server_socket = socket.create_server(
+                ("", self.listen_port), family=socket.AF_INET6, dualstack_ipv6=True
+            )
+        else:
+            self.server_socket = socket.create_server(("", self.listen_port))
+        self.running = True
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def stop(self):
+        """Stop accepting and close every forwarded connection"""
+        self.running = False
+        if self.server_socket:
+            try:
+                self.server_socket.close()
+            except OSError:
+                pass
+            self.server_socket = None
+        self.fail_activation()
+        with self.lock:
+            sockets = [s for pair in self.connections for s in pair]
+            self.connections.clear()
+        for s in sockets:
+            self._close(s)
+
+    def set_backend(self, port):
+        """Send new connections, and any held ones, to a backend port"""
+        self.backend_port = port
+        self.activating = False
+        self.ready.set()
+
+    def suspend(self):
+        """Hold new connections until a backend is set again"""
+        self.ready.clear()
+        self.backend_port = None
+
+    def fail_activation(self):
+        """Close the connections held for a backend that did not come up"""
+        if self.backend_port is None:
+            self.activating = False
+            self.ready.set()
+            self.ready.clear()
+
+    def active_connections(self, port=None):
+        """Number of open connections, optionally only those to one backend port"""
+        with self.lock:
+            return sum(1 for p in self.connections.values() if port is None or p == port)
+
+    def idle_seconds(self):
+        """Seconds since the last connection or transferred data, 0 while connections are open"""
+        if self.active_connections():
+            return 0
+        return time.time() - self.last_activity
+
+    def _accept_loop(self):
+        while self.running:
+            try:
+                client, _ = self.server_socket.accept()
+            except OSError:
+                break
+            self.last_activity = time.time()
+            threading.Thread(target=self._handle, args=(client,), daemon=True).start()
+
+    def _wait_for_backend(self):
+        """Hold a connection until a backend is ready; False if none came up in time"""
+        held_since = time.perf_counter()
+        with self.lock:
+            trigger = not self.activating
+            self.activating = True
+        if trigger and self.on_activate:
+            self.on_activate()
+        if not self.ready.wait(self.activation_timeout) or self.backend_port is None:
+            return False
+        if trigger and self.on_cold_start:
+            self.on_cold_start(time.perf_counter() - held_since)
+        return True
+
+    def _handle(self, client):
+        if not self.ready.is_set() and not self._wait_for_backend():
+            self._close(client)
+            return
+        port = self.backend_port
+        try:
+            upstream = socket.create_connection((self.backend_host, port), timeout=10)
+            upstream.settimeout(None)
+        except OSError:
+            self._close(client)
+            return
+        pair = (client, upstream)
+        with self.lock:
+            self.connections[pair] = port
+        pump = threading.Thread(target=self._pump, args=(upstream, client), daemon=True)
+        pump.start()
+        self._pump(client, upstream)
+        pump.join()
+        with self.lock:
+            self.connections.pop(pair, None)
+        self.last_activity = time.time()
+        self._close(client)
+        self._close(upstream)
+
+    def _pump(self, source, destination):
+        try:
+            while True:
+                data = source.recv(65536)
+                if not data:
+                    break
+                destination.sendall(data)
+                self.last_activity = time.time()
+        except OSError:
+            pass
+        try:
+            destination.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+    def _close(self, s):
+        try:
+            s.close()
+        except OSError:
+            pass
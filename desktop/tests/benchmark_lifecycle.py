@@ -0,0 +1,82 @@
+"""
+Start, stop and restart latency benchmark for the launcher
+Runs headless against stub_server.py and exits non-zero when a p99 budget is exceeded
+
+Usage: python tests/benchmark_lifecycle.py --iterations 20 --max-start-p99-ms 2000
+"""
+import argparse
+import json
+import sys
+
+import lifecycle_harness
+from latency_probe import LatencyHistogram
+from lifecycle_harness import start, stop, stub_command
+
+
+def summarize(samples_ms):
+    histogram = LatencyHistogram(significant_digits=3)
+    for sample in samples_ms:
+        histogram.record(sample)
+    return {
+        "count": len(samples_ms),
+        "p50": histogram.percentile(50),
+        "p90": histogram.percentile(90),
+        "p99": histogram.percentile(99),
+        "max": max(samples_ms) if samples_ms else None,
+    }
+
+
+def run_benchmark(iterations, bind_delay=0.0):
+    instance = lifecycle_harness.make_launcher(server_command=stub_command(bind_delay=bind_delay or None))
+    samples = {"start": [], "stop": [], "restart": []}
+    try:
+        for _ in range(iterations):
+            success, start_seconds = start(instance)
+            if not success:
+                raise RuntimeError("server failed to start during benchmark")
+            samples["start"].append(start_seconds * 1000)
+            samples["stop"].append(stop(instance) * 1000)
+
+            start(instance)
+            stop_seconds = stop(instance)
+            success, start_seconds = start(instance)
+            if not success:
+                raise RuntimeError("server failed to restart during benchmark")
+            samples["restart"].append((stop_seconds + start_seconds) * 1000)
+            stop(instance)
+    finally:
+        instance.stop_server()
+        instance.remove_data_dir()
+    return {phase: summarize(values) for phase, values in samples.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--bind-delay", type=float, default=0.0, help="seconds the stub server waits before binding")
+    parser.add_argument("--json", help="write the results to this file")
+    for phase in ("start", "stop", "restart"):
+        parser.add_argument(f"--max-{phase}-p99-ms", type=float, default=None, help=f"fail if {phase} p99 exceeds this")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.iterations, args.bind_delay)
+
+    print(f"{'phase':<10}{'count':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for phase, stats in results.items():
+        print(f"{phase:<10}{stats['count']:>7}{stats['p50']:>10.0f}{stats['p90']:>10.0f}{stats['p99']:>10.0f}{stats['max']:>10.0f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    failed = False
+    for phase, stats in results.items():
+        budget = getattr(args, f"max_{phase}_p99_ms")
+        if budget is not None and stats["p99"] > budget:
+            print(f"✗ {phase} p99 {stats['p99']:.0f} ms is over the {budget:.0f} ms budget")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+import pytest
+from PySide6.QtCore import QCoreApplication, QEvent
+
+import lifecycle_harness
+
+
+@pytest.fixture
+def make_launcher():
+    """Factory for headless launchers; every server they start is stopped afterwards"""
+    created = []
+
+    def factory(**settings):
+        instance = lifecycle_harness.make_launcher(**settings)
+        created.append(instance)
+        return instance
+
+    yield factory
+    for instance in created:
+        instance.stop_server()
+        instance.state_timer.stop()
+        instance.remove_data_dir()
+        instance.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+@pytest.fixture
+def launcher(make_launcher):
+    return make_launcher()
+
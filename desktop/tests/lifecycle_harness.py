@@ -0,0 +1,130 @@
+"""
+Shared helpers for the launcher lifecycle tests and benchmark
+Builds a headless launcher whose server command runs stub_server.py instead of npm
+"""
+import os
+import shlex
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("PYSTRAY_BACKEND", "dummy")
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DESKTOP_DIR = os.path.dirname(TESTS_DIR)
+if DESKTOP_DIR not in sys.path:
+    sys.path.insert(0, DESKTOP_DIR)
+
+import launcher  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+STUB_SERVER = os.path.join(TESTS_DIR, "stub_server.py")
+
+
+def free_port():
+    """Return a TCP port nothing is listening on"""
+    with socket.socket() as s:
+        s.bind(("", 0))
+        return s.getsockname()[1]
+
+
+def stub_command(**options):
+    """Server command template running the stub server with the given options"""
+    parts = [sys.executable, STUB_SERVER, "--port", "{port}"]
+    for name, value in options.items():
+        flag = "--" + name.replace("_", "-")
+        if value is True:
+            parts.append(flag)
+        elif value not in (None, False):
+            parts += [flag, str(value)]
+    if sys.platform == "win32":
+        # The command runs through cmd /c, which does not understand POSIX single quotes
+        return subprocess.list2cmdline(parts)
+    return " ".join(shlex.quote(part) if part != "{port}" else part for part in parts)
+
+
+def application():
+    """The process-wide QApplication"""
+    return QApplication.instance() or QApplication([])
+
+
+class HeadlessLauncher(launcher.PySideTodoAppLauncher):
+    """Launcher without a tray icon or browser, recording what it would have opened"""
+
+    def __init__(self, settings=None):
+        self.opened_urls = []
+        self.console_lines = []
+        super().__init__()
+        self.settings.update(settings or {})
+        self.port = free_port()
+        self.active_port = self.port
+        # Keep traces in memory and everything else in a temporary folder instead of launcher_data
+        self.tracer = launcher.Tracer(root_names=launcher.TRACE_NAMES)
+        self.data_dir = tempfile.mkdtemp(prefix="launcher_data_")
+        self.recycle_log = launcher.EventLog(os.path.join(self.data_dir, "recycle_events.jsonl"))
+        self.maintenance_history = launcher.JobHistory(os.path.join(self.data_dir, "maintenance_history.jsonl"))
+        self.on_demand_log = launcher.EventLog(os.path.join(self.data_dir, "on_demand_events.jsonl"))
+        self.backup_dir = os.path.join(self.data_dir, "backups")
+        self.runtime_tuning_path = os.path.join(self.data_dir, "runtime_tuning.json")
+        self.query_stats_path = os.path.join(self.data_dir, "query_stats.json")
+        self.query_events_path = os.path.join(self.data_dir, "query_events.log")
+        if self.proxy_enabled():
+            self.settings["backend_ports"] = [free_port(), free_port()]
+
+    def create_system_tray(self):
+        self.icon = None
+
+    def log_to_console(self, message):
+        self.console_lines.append(message)
+
+    def open_browser(self):
+        self.opened_urls.append(f'http://localhost:{self.port}')
+
+    def remove_data_dir(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+
+def make_launcher(**settings):
+    """Create a headless launcher running the stub server in direct mode"""
+    application()
+    defaults = {
+        "server_command": stub_command(),
+        "server_start_timeout_seconds": 10,
+        "recycle_rss_ceiling_mb": 0,
+    }
+    defaults.update(settings)
+    return HeadlessLauncher(defaults)
+
+
+def start(instance):
+    """Run ServerThread synchronously and return (success, seconds)"""
+    results = []
+    thread = launcher.ServerThread(instance)
+    thread.server_started.connect(results.append)
+    thread.log_message.connect(instance.log_to_console)
+    started = time.perf_counter()
+    thread.run()
+    return (results[-1] if results else False), time.perf_counter() - started
+
+
+def wait_for(condition, timeout=10):
+    """Process Qt events until condition() is true; return whether it became true"""
+    app = application()
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        app.processEvents()
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def stop(instance):
+    """Run stop_server and return the seconds it took"""
+    started = time.perf_counter()
+    instance.stop_server()
+    return time.perf_counter() - started
@@ -0,0 +1,108 @@
+"""
+Stub HTTP server standing in for `npm run start` in the launcher tests
+Answers /api/health like the Next.js app and can be made slow to bind, crash or ignore SIGTERM
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    response_delay = 0.0
+    build_id = None
+    emit_queries = False
+
+    def do_GET(self):
+        if self.response_delay:
+            time.sleep(self.response_delay)
+        if self.path.startswith("/api/health"):
+            body = json.dumps({
+                "message": "Good!",
+                "buildId": self.build_id,
+                "pid": os.getpid(),
+                "nodeOptions": os.environ.get("NODE_OPTIONS"),
+                "uvThreadpoolSize": os.environ.get("UV_THREADPOOL_SIZE"),
+            }).encode()
+        else:
+            body = b"[]"
+        if self.emit_queries and self.path.startswith("/api/tasks"):
+            self.write_query_events()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def write_query_events(self):
+        """Append the events db.ts writes to PRISMA_QUERY_EVENTS_FILE for a task list request"""
+        path = os.environ.get("PRISMA_QUERY_EVENTS_FILE")
+        if not path:
+            return
+        statements = [
+            ('SELECT "public"."Task"."id" FROM "public"."Task" WHERE "public"."Task"."userId" = $1 OFFSET $2', 4.0),
+            ('SELECT "public"."Priority"."id" FROM "public"."Priority" WHERE "public"."Priority"."id" IN ($1,$2,$3)', 1.5),
+        ]
+        lines = [f"prisma:query-event {json.dumps({'query': sql, 'durationMs': ms})}" for sql, ms in statements]
+        operation = {"model": "Task", "operation": "findMany", "durationMs": 6.0, "rows": 3}
+        lines.append(f"prisma:operation-event {json.dumps(operation)}")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def set_process_title(title):
+    """Change the name psutil reports for this process, as process.title does in Node"""
+    import ctypes
+    libc = ctypes.CDLL(None)
+    PR_SET_NAME = 15
+    libc.prctl(PR_SET_NAME, ctypes.c_char_p(title.encode()[:15]), 0, 0, 0)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--bind-delay", type=float, default=0.0, help="seconds to wait before binding")
+    parser.add_argument("--crash-before-bind", action="store_true", help="exit with an error instead of binding")
+    parser.add_argument("--crash-after", type=float, default=None, help="exit with an error this many seconds after binding")
+    parser.add_argument("--ignore-sigterm", action="store_true", help="ignore SIGTERM so only SIGKILL stops the server")
+    parser.add_argument("--spawn-child", action="store_true", help="start a child process, like npm starting node")
+    parser.add_argument("--build-id", default=None, help="build id reported by /api/health")
+    parser.add_argument("--emit-queries", action="store_true", help="write Prisma query events for task list requests")
+    parser.add_argument("--process-title", default=None, help="rename the process like Next.js does (Linux only)")
+    parser.add_argument("--response-delay", type=float, default=0.0, help="seconds to wait before every response")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.process_title:
+        set_process_title(args.process_title)
+    if args.ignore_sigterm:
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    if args.spawn_child:
+        child_args = [sys.executable, "-c", "import time; time.sleep(3600)"]
+        subprocess.Popen(child_args)
+    if args.bind_delay:
+        time.sleep(args.bind_delay)
+    if args.crash_before_bind:
+        sys.exit(1)
+
+    StubHandler.response_delay = args.response_delay
+    StubHandler.build_id = args.build_id
+    StubHandler.emit_queries = args.emit_queries
+    server = ThreadingHTTPServer(("", args.port), StubHandler)
+    if args.crash_after is not None:
+        threading.Timer(args.crash_after, lambda: os._exit(1)).start()
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import os
+import time
+
+from attachment_store import AttachmentStore
+
+
+class FakeDatabaseStore(AttachmentStore):
+    """AttachmentStore whose Attachment table is an in-memory dict"""
+
+    def __init__(self, project_root, rows, extra_references=(), **kwargs):
+        super().__init__(project_root, "postgresql://unused", state_path=os.path.join(project_root, "gc.json"), **kwargs)
+        self.rows = rows
+        self.extra_references = set(extra_references)
+
+    def fetch_attachment_paths(self):
+        return sorted(set(self.rows.values()))
+
+    def fetch_referenced_paths(self):
+        return set(self.rows.values()) | self.extra_references
+
+    def rewrite_paths(self, mapping):
+        updated = 0
+        for row_id, path in self.rows.items():
+            if path in mapping:
+                self.rows[row_id] = mapping[path]
+                updated += 1
+        return updated
+
+
+def write_upload(root, name, content, age_seconds=0):
+    assets = os.path.join(root, "public", "assets")
+    os.makedirs(assets, exist_ok=True)
+    path = os.path.join(assets, name)
+    with open(path, "wb") as f:
+        f.write(content)
+    if age_seconds:
+        old = time.time() - age_seconds
+        os.utime(path, (old, old))
+    return f"/assets/{name}"
+
+
+def test_migrate_deduplicates_identical_uploads(tmp_path):
+    root = str(tmp_path)
+    first = write_upload(root, "shot_1.png", b"same bytes")
+    second = write_upload(root, "shot_2.PNG", b"same bytes")
+    other = write_upload(root, "doc_3.pdf", b"other bytes")
+    store = FakeDatabaseStore(root, {"a": first, "b": second, "c": other})
+
+    stats = store.migrate()
+
+    assert stats["files"] == 3
+    assert stats["deduplicated"] == 1
+    assert stats["rows_updated"] == 3
+    assert store.rows["a"] == store.rows["b"]
+    assert store.rows["a"].startswith("/assets/cas/")
+    assert store.rows["a"].endswith(".png")
+    assert os.path.isfile(store.file_for(store.rows["c"]))
+
+
+def test_migrate_dry_run_changes_nothing(tmp_path):
+    root = str(tmp_path)
+    upload = write_upload(root, "shot_1.png", b"bytes")
+    store = FakeDatabaseStore(root, {"a": upload})
+
+    stats = store.migrate(dry_run=True)
+
+    assert stats["files"] == 1
+    assert store.rows["a"] == upload
+    assert not os.path.exists(os.path.join(root, "public", "assets", "cas"))
+
+
+def test_sweep_removes_only_old_unreferenced_files(tmp_path):
+    root = str(tmp_path)
+    kept = write_upload(root, "kept.png", b"1", age_seconds=7200)
+    in_description = write_upload(root, "inline.png", b"2", age_seconds=7200)
+    orphan = write_upload(root, "orphan.png", b"3", age_seconds=7200)
+    fresh = write_upload(root, "fresh.png", b"4")
+    store = FakeDatabaseStore(root, {"a": kept}, extra_references=[in_description], grace_seconds=3600)
+
+    stats = store.sweep()
+
+    assert stats["removed"] == 1
+    assert stats["complete"]
+    assert not os.path.exists(store.file_for(orphan))
+    for url in (kept, in_description, fresh):
+        assert os.path.exists(store.file_for(url))
+
+
+def test_sweep_resumes_from_cursor(tmp_path):
+    root = str(tmp_path)
+    orphans = [write_upload(root, f"orphan_{i}.png", bytes([i]), age_seconds=7200) for i in range(5)]
+    store = FakeDatabaseStore(root, {}, grace_seconds=3600)
+
+    first = store.sweep(max_files=2)
+    second = store.sweep(max_files=10)
+
+    assert first["removed"] == 2 and not first["complete"]
+    assert second["removed"] == 3 and second["complete"]
+    assert not any(os.path.exists(store.file_for(url)) for url in orphans)
+    assert store.load_cursor() is None
+
+
+def test_migrated_originals_are_swept(tmp_path):
+    root = str(tmp_path)
+    upload = write_upload(root, "shot_1.png", b"bytes", age_seconds=7200)
+    store = FakeDatabaseStore(root, {"a": upload}, grace_seconds=3600)
+
+    store.migrate()
+    store.sweep()
+
+    assert not os.path.exists(store.file_for(upload))
+    assert os.path.isfile(store.file_for(store.rows["a"]))
@@ -0,0 +1,34 @@
+import socket
+
+from latency_probe import LatencyProbe
+from launcher_settings import DEFAULT_SETTINGS
+
+
+def test_timed_out_probe_counts_as_error_and_slow_sample():
+    # A listener that accepts connections but never answers, like a stalled event loop
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(8)
+    settings = dict(DEFAULT_SETTINGS, probe_timeout_seconds=0.2, probe_db_route="")
+    probe = LatencyProbe(f"http://127.0.0.1:{listener.getsockname()[1]}", settings)
+    try:
+        stats = probe.sample()
+    finally:
+        listener.close()
+
+    assert stats["health"]["errors"] == 1
+    assert stats["health"]["count"] == 1
+    assert stats["health"]["p99"] >= 200
+
+
+def test_refused_probe_is_only_an_error():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    port = listener.getsockname()[1]
+    listener.close()
+    probe = LatencyProbe(f"http://127.0.0.1:{port}", dict(DEFAULT_SETTINGS, probe_db_route=""))
+
+    stats = probe.sample()
+
+    assert stats["health"]["errors"] == 1
+    assert stats["health"]["count"] == 0
@@ -0,0 +1,404 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+import psutil
+import pytest
+
+import launcher as launcher_module
+from lifecycle_harness import STUB_SERVER, start, stop, stub_command, wait_for
+from memory_recycler import EventLog
+
+# Spawns stubs in new sessions and relies on SIGTERM being ignorable
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="lifecycle tests use POSIX signals")
+
+
+def spawn_stub(port, *flags, cwd=None):
+    process = subprocess.Popen(
+        [sys.executable, STUB_SERVER, "--port", str(port), *flags], cwd=cwd, start_new_session=True
+    )
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        for conn in psutil.net_connections(kind="inet"):
+            if conn.laddr.port == port and conn.status == psutil.CONN_LISTEN:
+                return process
+        time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("stub server did not bind")
+
+
+def health_pid(port):
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/health", timeout=5) as response:
+        return json.loads(response.read().decode())["pid"]
+
+
+def test_start_on_free_port(launcher):
+    success, _ = start(launcher)
+
+    assert success
+    assert launcher.server_running
+    assert launcher.check_port_in_use() is not None
+    assert launcher.opened_urls == [f"http://localhost:{launcher.port}"]
+
+
+def test_start_replaces_existing_listener(launcher):
+    stale = spawn_stub(launcher.port)
+
+    success, _ = start(launcher)
+
+    assert success
+    assert stale.wait(timeout=5) is not None
+    assert launcher.check_port_in_use() != stale.pid
+
+
+def test_start_waits_for_slow_bind(make_launcher):
+    instance = make_launcher(server_command=stub_command(bind_delay=1.5))
+
+    success, elapsed = start(instance)
+
+    assert success
+    assert elapsed >= 1.5
+
+
+def test_start_fails_when_bind_exceeds_timeout(make_launcher):
+    instance = make_launcher(server_command=stub_command(bind_delay=30), server_start_timeout_seconds=1)
+
+    success, _ = start(instance)
+
+    assert not success
+    assert not instance.server_running
+    assert instance.cmd_process is None
+    assert instance.opened_urls == []
+
+
+def test_start_fails_fast_when_server_crashes(make_launcher):
+    instance = make_launcher(server_command=stub_command(crash_before_bind=True), server_start_timeout_seconds=30)
+
+    success, elapsed = start(instance)
+
+    assert not success
+    assert elapsed < 10
+    assert "✗ Server failed to start - port not in use" in instance.console_lines
+
+
+def test_stop_frees_port(launcher):
+    start(launcher)
+
+    stop(launcher)
+
+    assert not launcher.server_running
+    assert launcher.cmd_process is None
+    assert launcher.check_port_in_use() is None
+
+
+def test_stop_kills_server_ignoring_sigterm(make_launcher):
+    instance = make_launcher(server_command=stub_command(ignore_sigterm=True))
+    start(instance)
+    pid = instance.check_port_in_use()
+
+    stop(instance)
+
+    assert instance.check_port_in_use() is None
+    assert not psutil.pid_exists(pid) or psutil.Process(pid).status() == psutil.STATUS_ZOMBIE
+
+
+def test_stop_after_server_crashed(make_launcher):
+    instance = make_launcher(server_command=stub_command(crash_after=0.5))
+    start(instance)
+    time.sleep(1)
+
+    stop(instance)
+
+    assert instance.check_port_in_use() is None
+    assert "✓ Server stop process completed" in instance.console_lines
+
+
+def test_stop_when_nothing_running(launcher):
+    stop(launcher)
+
+    assert f"✓ No process found on port {launcher.port}" in launcher.console_lines
+
+
+def test_restart(launcher):
+    start(launcher)
+    first_pid = launcher.check_port_in_use()
+    stop(launcher)
+
+    success, _ = start(launcher)
+
+    assert success
+    assert launcher.check_port_in_use() not in (None, first_pid)
+
+
+def test_kill_process_on_port_kills_children(launcher):
+    stub = spawn_stub(launcher.port, "--spawn-child", "--ignore-sigterm")
+    children = psutil.Process(stub.pid).children(recursive=True)
+    assert children
+
+    launcher.kill_process_on_port(stub.pid)
+
+    assert stub.wait(timeout=5) is not None
+    for child in children:
+        assert not child.is_running() or child.status() == psutil.STATUS_ZOMBIE
+
+
+def test_kill_process_on_port_ignores_own_pid(launcher):
+    launcher.kill_process_on_port(os.getpid())
+
+    assert psutil.Process(os.getpid()).is_running()
+
+
+def test_recycle_switches_traffic_to_replacement(make_launcher, tmp_path):
+    instance = make_launcher(recycle_rss_ceiling_mb=1024, recycle_drain_timeout_seconds=2)
+    instance.recycle_log = EventLog(str(tmp_path / "recycle_events.jsonl"))
+    success, _ = start(instance)
+    assert success
+    old_port = instance.active_port
+    old_pid = health_pid(instance.port)
+
+    recycle = launcher_module.RecycleThread(instance, 2048)
+    results = []
+    recycle.recycle_finished.connect(results.append)
+    recycle.run()
+
+    assert results == [True]
+    trace = instance.tracer.last("recycle")
+    assert trace["spans"][0]["args"]["result"] == "ok"
+    assert {"spawn", "health", "drain", "kill_process"} <= {span["name"] for span in trace["spans"]}
+    assert instance.active_port != old_port
+    assert health_pid(instance.port) != old_pid
+    assert instance.check_port_in_use(old_port) is None
+    assert instance.recycle_log.read()[-1]["event"] == "recycled"
+
+
+def test_recycle_keeps_old_server_when_replacement_unhealthy(make_launcher, tmp_path):
+    instance = make_launcher(recycle_rss_ceiling_mb=1024, recycle_health_timeout_seconds=1)
+    instance.recycle_log = EventLog(str(tmp_path / "recycle_events.jsonl"))
+    start(instance)
+    old_port = instance.active_port
+    old_pid = health_pid(instance.port)
+    instance.settings["server_command"] = stub_command(crash_before_bind=True)
+
+    recycle = launcher_module.RecycleThread(instance, 2048)
+    results = []
+    recycle.recycle_finished.connect(results.append)
+    recycle.run()
+
+    assert results == [False]
+    assert instance.active_port == old_port
+    assert health_pid(instance.port) == old_pid
+    assert instance.recycle_log.read()[-1]["event"] == "recycle_failed"
+
+
+def make_project(tmp_path, build_id="build-1"):
+    os.makedirs(tmp_path / ".next")
+    (tmp_path / ".next" / "BUILD_ID").write_text(build_id)
+    return str(tmp_path)
+
+
+def make_adopting_launcher(make_launcher, project_root, **settings):
+    instance = make_launcher(server_process_names=[os.path.basename(psutil.Process().exe())], **settings)
+    instance.project_root = project_root
+    return instance
+
+
+def test_start_adopts_healthy_server_of_same_build(make_launcher, tmp_path):
+    project_root = make_project(tmp_path)
+    instance = make_adopting_launcher(make_launcher, project_root)
+    running = spawn_stub(instance.port, "--build-id", "build-1", cwd=project_root)
+
+    success, elapsed = start(instance)
+
+    assert success
+    assert running.poll() is None
+    assert instance.cmd_process.pid == running.pid
+    assert f"✓ Adopted running server (PID {running.pid}) on port {instance.port}" in instance.console_lines
+    assert elapsed < 3
+
+    stop(instance)
+
+    assert running.wait(timeout=5) is not None
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="process titles are set with prctl")
+def test_start_adopts_server_with_changed_process_title(make_launcher, tmp_path):
+    project_root = make_project(tmp_path)
+    instance = make_adopting_launcher(make_launcher, project_root)
+    running = spawn_stub(instance.port, "--build-id", "build-1", "--process-title", "next-server (v15.3.5)", cwd=project_root)
+    assert psutil.Process(running.pid).name() != os.path.basename(psutil.Process().exe())
+
+    success, _ = start(instance)
+
+    assert success
+    assert instance.cmd_process.pid == running.pid
+
+
+def test_start_replaces_server_of_other_build(make_launcher, tmp_path):
+    project_root = make_project(tmp_path, build_id="build-2")
+    instance = make_adopting_launcher(make_launcher, project_root)
+    running = spawn_stub(instance.port, "--build-id", "build-1", cwd=project_root)
+
+    success, _ = start(instance)
+
+    assert success
+    assert running.wait(timeout=5) is not None
+    assert f"Server {running.pid} on port {instance.port} runs a different build" in instance.console_lines
+
+
+def test_start_replaces_server_of_other_project(make_launcher, tmp_path):
+    project_root = make_project(tmp_path / "project")
+    instance = make_adopting_launcher(make_launcher, project_root)
+    running = spawn_stub(instance.port, "--build-id", "build-1", cwd=str(tmp_path))
+
+    success, _ = start(instance)
+
+    assert success
+    assert running.wait(timeout=5) is not None
+
+
+def test_start_adopts_backend_behind_proxy(make_launcher, tmp_path):
+    project_root = make_project(tmp_path)
+    instance = make_adopting_launcher(make_launcher, project_root, recycle_rss_ceiling_mb=1024)
+    backend_port = instance.settings["backend_ports"][1]
+    running = spawn_stub(backend_port, "--build-id", "build-1", cwd=project_root)
+
+    success, _ = start(instance)
+
+    assert success
+    assert instance.active_port == backend_port
+    assert health_pid(instance.port) == running.pid
+
+
+def make_on_demand_launcher(make_launcher, tmp_path, **settings):
+    instance = make_launcher(on_demand_enabled=True, maintenance_enabled=False, **settings)
+    instance.on_demand_log = EventLog(str(tmp_path / "on_demand_events.jsonl"))
+    return instance
+
+
+def request_in_background(port):
+    results = []
+    thread = threading.Thread(target=lambda: results.append(health_pid(port)), daemon=True)
+    thread.start()
+    return thread, results
+
+
+def test_on_demand_waits_for_first_request(make_launcher, tmp_path):
+    instance = make_on_demand_launcher(make_launcher, tmp_path)
+
+    instance.start_server()
+
+    assert instance.on_demand_armed
+    assert not instance.server_running
+    assert instance.check_port_in_use() == os.getpid()
+    assert instance.cmd_process is None
+    assert instance.tracer.last("arm") is not None
+    assert instance.tracer.last("free_port") is None
+
+
+def test_on_demand_starts_server_for_held_request(make_launcher, tmp_path):
+    instance = make_on_demand_launcher(make_launcher, tmp_path, server_command=stub_command(bind_delay=0.5))
+    instance.start_server()
+
+    thread, results = request_in_background(instance.port)
+
+    assert wait_for(lambda: results and instance.cold_starts)
+    thread.join()
+    assert instance.server_running
+    assert results and instance.cmd_process is not None
+    assert instance.cold_starts[0] >= 0.5
+    assert instance.opened_urls == []
+    assert instance.on_demand_log.read()[-1]["event"] == "cold_start"
+
+
+def test_on_demand_suspends_idle_server_and_restarts(make_launcher, tmp_path):
+    instance = make_on_demand_launcher(make_launcher, tmp_path)
+    instance.start_server()
+    thread, results = request_in_background(instance.port)
+    assert wait_for(lambda: results and instance.server_running)
+    thread.join()
+    first_pid = results[0]
+
+    instance.suspend_server(idle_seconds=900)
+
+    assert not instance.server_running
+    assert instance.on_demand_armed
+    assert all(instance.check_port_in_use(port) is None for port in instance.settings["backend_ports"])
+    assert instance.health_summary()[0] == "Suspended"
+
+    thread, results = request_in_background(instance.port)
+    assert wait_for(lambda: results and len(instance.cold_starts) == 2)
+    thread.join()
+    assert results[0] != first_pid
+
+
+def test_on_demand_check_idle_keeps_busy_server(make_launcher, tmp_path):
+    instance = make_on_demand_launcher(make_launcher, tmp_path, on_demand_idle_minutes=0)
+    instance.start_server()
+    thread, results = request_in_background(instance.port)
+    assert wait_for(lambda: results and instance.server_running)
+    thread.join()
+
+    instance.settings["on_demand_idle_minutes"] = 1
+    instance.check_idle()
+    assert instance.server_running
+
+    instance.settings["on_demand_idle_minutes"] = 0
+    instance.check_idle()
+    assert not instance.server_running
+
+
+def test_on_demand_releases_request_when_start_fails(make_launcher, tmp_path):
+    instance = make_on_demand_launcher(
+        make_launcher, tmp_path, server_command=stub_command(crash_before_bind=True)
+    )
+    instance.start_server()
+    errors = []
+
+    def request():
+        try:
+            health_pid(instance.port)
+        except OSError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=request, daemon=True)
+    thread.start()
+
+    assert wait_for(lambda: errors)
+    assert not instance.server_running
+    assert instance.on_demand_armed
+
+
+def test_start_stops_backend_when_proxy_cannot_bind(make_launcher):
+    instance = make_launcher(recycle_rss_ceiling_mb=1024)
+    blocker = socket.create_server(("", instance.port))
+    try:
+        success, _ = start(instance)
+    finally:
+        blocker.close()
+
+    assert not success
+    assert not instance.server_running
+    assert instance.cmd_process is None
+    assert instance.proxy is None
+    assert instance.active_port == instance.port
+    assert all(instance.check_port_in_use(port) is None for port in instance.settings["backend_ports"])
+
+
+def test_on_demand_maintenance_wake_is_not_a_cold_start(make_launcher, tmp_path):
+    instance = make_on_demand_launcher(make_launcher, tmp_path)
+    instance.start_server()
+    job = instance.with_server("reminders", lambda: health_pid(instance.port))
+    results = []
+    thread = threading.Thread(target=lambda: results.append(job()), daemon=True)
+    thread.start()
+
+    assert wait_for(lambda: results)
+    thread.join()
+    assert instance.server_running
+    assert instance.cold_starts == []
+    assert [e["event"] for e in instance.on_demand_log.read()] == ["maintenance_wake"]
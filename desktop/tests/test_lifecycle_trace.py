@@ -0,0 +1,114 @@
+import json
+import threading
+
+import pytest
+
+from lifecycle_harness import start, stop
+from lifecycle_trace import TraceLog, Tracer, slowest_phase, to_chrome_trace
+
+
+def span_names(trace):
+    return [span["name"] for span in trace["spans"]]
+
+
+def test_nested_spans_form_one_trace():
+    tracer = Tracer()
+
+    with tracer.span("start", activation=False):
+        with tracer.span("port_scan"):
+            with tracer.span("kill_process", pid=1):
+                pass
+        with tracer.span("spawn"):
+            pass
+
+    trace = tracer.last("start")
+    parents = {span["name"]: span["parent"] for span in trace["spans"]}
+    assert span_names(trace) == ["start", "port_scan", "kill_process", "spawn"]
+    assert parents == {"start": None, "port_scan": 0, "kill_process": 1, "spawn": 0}
+    assert trace["spans"][0]["args"] == {"activation": False}
+    assert all(span["start_ms"] >= 0 for span in trace["spans"])
+
+
+def test_spans_on_other_threads_start_their_own_trace():
+    tracer = Tracer()
+
+    def start_on_worker():
+        with tracer.span("start"):
+            pass
+
+    with tracer.span("quit"):
+        with tracer.span("stop"):
+            worker = threading.Thread(target=start_on_worker)
+            worker.start()
+            worker.join()
+
+    assert span_names(tracer.last("quit")) == ["quit", "stop"]
+    assert span_names(tracer.last("start")) == ["start"]
+
+
+def test_failed_span_records_error():
+    tracer = Tracer()
+
+    with pytest.raises(RuntimeError):
+        with tracer.span("stop"):
+            with tracer.span("terminate"):
+                raise RuntimeError("boom")
+
+    assert tracer.last("stop")["spans"][1]["args"] == {"error": "boom"}
+
+
+def test_trace_log_is_bounded(tmp_path):
+    log = TraceLog(str(tmp_path / "traces.jsonl"), max_traces=3)
+    tracer = Tracer(log)
+
+    for number in range(8):
+        with tracer.span("start", number=number):
+            pass
+
+    traces = log.read()
+    assert 3 <= len(traces) < 6
+    assert traces[-1]["spans"][0]["args"]["number"] == 7
+    assert [t["spans"][0]["args"]["number"] for t in log.read("start", limit=2)] == [6, 7]
+
+
+def test_chrome_export_puts_each_trace_in_its_own_lane():
+    tracer = Tracer()
+    for _ in range(2):
+        with tracer.span("start"):
+            with tracer.span("port_bind"):
+                pass
+
+    exported = json.loads(json.dumps(to_chrome_trace(list(tracer.recent))))
+
+    spans = [e for e in exported["traceEvents"] if e["ph"] == "X"]
+    assert [(e["pid"], e["name"]) for e in spans] == [(1, "start"), (1, "port_bind"), (2, "start"), (2, "port_bind")]
+    assert all(e["dur"] >= 1 and e["ts"] >= 0 for e in spans)
+    root, child = spans[:2]
+    assert root["ts"] <= child["ts"] and child["ts"] + child["dur"] <= root["ts"] + root["dur"] + 1
+    assert {e["pid"] for e in exported["traceEvents"] if e["name"] == "process_name"} == {1, 2}
+
+
+def test_launcher_traces_start_and_stop_phases(launcher):
+    start(launcher)
+    stop(launcher)
+
+    start_trace = launcher.tracer.last("start")
+    stop_trace = launcher.tracer.last("stop")
+    assert start_trace["spans"][0]["args"]["result"] == "ok"
+    assert {"adoption_check", "port_scan", "spawn", "port_bind", "browser_open"} <= set(span_names(start_trace))
+    assert {"stop_monitors", "terminate", "free_port"} <= set(span_names(stop_trace))
+    assert slowest_phase(stop_trace)["parent"] == 0
+
+
+def test_parentless_helper_spans_are_not_kept(tmp_path):
+    log = TraceLog(str(tmp_path / "traces.jsonl"))
+    tracer = Tracer(log, root_names=("start",))
+
+    with tracer.span("free_port", port=1):
+        pass
+    with tracer.span("start"):
+        with tracer.span("free_port", port=1):
+            pass
+
+    assert [t["name"] for t in log.read()] == ["start"]
+    assert tracer.last("free_port") is None
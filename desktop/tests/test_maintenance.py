@@ -0,0 +1,140 @@
+import subprocess
+import sys
+import threading
+import time
+
+import maintenance
+from maintenance import JobHistory, MaintenanceJob, MaintenanceScheduler, run_process, run_psql
+
+
+def make_scheduler(tmp_path, jobs, busy=None, server_running=True):
+    history = JobHistory(str(tmp_path / "history.jsonl"))
+    return MaintenanceScheduler(
+        jobs, history, lambda: busy, lambda: server_running, postpone_seconds=60, max_postpone_seconds=600
+    )
+
+
+def test_runs_job_and_records_duration(tmp_path):
+    calls = []
+    job = MaintenanceJob("backup", lambda: calls.append(1) or "done", 3600)
+    scheduler = make_scheduler(tmp_path, [job])
+    deadline = time.time()
+
+    next_deadline = scheduler.execute(job, deadline)
+
+    assert calls == [1]
+    assert next_deadline == deadline + 3600
+    last = scheduler.history.last("backup")
+    assert last["status"] == "ok"
+    assert last["detail"] == "done"
+    assert last["duration_seconds"] is not None
+
+
+def test_postpones_deferrable_job_when_busy(tmp_path):
+    calls = []
+    job = MaintenanceJob("vacuum_analyze", lambda: calls.append(1), 86400)
+    scheduler = make_scheduler(tmp_path, [job], busy="CPU busy (90%)")
+    deadline = time.time()
+
+    next_deadline = scheduler.execute(job, deadline)
+
+    assert calls == []
+    assert deadline + 59 <= next_deadline <= time.time() + 60
+    assert job.due_since == deadline
+    assert scheduler.history.last("vacuum_analyze")["status"] == "postponed"
+
+
+def test_skips_job_postponed_too_long(tmp_path):
+    job = MaintenanceJob("backup", lambda: None, 86400)
+    scheduler = make_scheduler(tmp_path, [job], busy="server slow (p99 900 ms)")
+    deadline = time.time() - 600
+
+    next_deadline = scheduler.execute(job, deadline)
+
+    assert next_deadline == deadline + 86400
+    assert job.due_since is None
+    assert scheduler.history.last("backup")["status"] == "skipped"
+
+
+def test_non_deferrable_job_runs_when_busy(tmp_path):
+    calls = []
+    job = MaintenanceJob("reminders", lambda: calls.append(1), 3600, deferrable=False)
+    scheduler = make_scheduler(tmp_path, [job], busy="CPU busy (90%)")
+
+    scheduler.execute(job, time.time())
+
+    assert calls == [1]
+
+
+def test_skips_server_job_when_server_stopped(tmp_path):
+    calls = []
+    job = MaintenanceJob("backup", lambda: calls.append(1), 86400)
+    scheduler = make_scheduler(tmp_path, [job], server_running=False)
+
+    scheduler.execute(job, time.time())
+
+    assert calls == []
+    assert scheduler.history.last("backup")["detail"] == "server not running"
+
+
+def test_failed_job_is_recorded(tmp_path):
+    def fail():
+        raise RuntimeError("psql not found")
+
+    job = MaintenanceJob("vacuum_analyze", fail, 86400, requires_server=False)
+    scheduler = make_scheduler(tmp_path, [job])
+
+    scheduler.execute(job, time.time())
+
+    last = scheduler.history.last("vacuum_analyze")
+    assert last["status"] == "failed"
+    assert last["detail"] == "psql not found"
+
+
+def test_daily_job_first_run_is_at_preferred_hour():
+    job = MaintenanceJob("backup", lambda: None, 86400, preferred_hour=4)
+
+    first = job.first_run(time.time())
+
+    assert time.localtime(first).tm_hour == 4
+    assert 0 < first - time.time() <= 86400
+
+
+def test_run_psql_passes_connection_as_option(monkeypatch):
+    calls = []
+
+    def fake_run(command, timeout, cancel=None, **kwargs):
+        calls.append((command, kwargs))
+        return subprocess.CompletedProcess(command, 0, stdout="ok", stderr="")
+
+    monkeypatch.setattr(maintenance, "run_process", fake_run)
+
+    assert run_psql("postgresql://u@localhost/todo?schema=public", ["-c", "SELECT 1"]) == "ok"
+
+    command, kwargs = calls[0]
+    assert command[:3] == ["psql", "-d", "postgresql://u@localhost/todo"]
+    assert command[-2:] == ["-c", "SELECT 1"]
+    assert all(not part.startswith("postgresql://") for part in command[3:])
+    assert kwargs["stdin"] == subprocess.DEVNULL
+
+
+def test_stop_cancels_running_subprocess_job(tmp_path):
+    cancel = threading.Event()
+    running = threading.Event()
+
+    def long_job():
+        running.set()
+        run_process([sys.executable, "-c", "import time; time.sleep(30)"], 60, cancel)
+
+    job = MaintenanceJob("vacuum_analyze", long_job, 1, deferrable=False, requires_server=False)
+    scheduler = MaintenanceScheduler(
+        [job], JobHistory(str(tmp_path / "history.jsonl")), lambda: None, lambda: True, stop_event=cancel
+    )
+    scheduler.start()
+    assert running.wait(5)
+
+    started = time.time()
+    assert scheduler.stop(timeout=5)
+
+    assert time.time() - started < 5
+    assert scheduler.history.last("vacuum_analyze")["status"] == "cancelled"
@@ -0,0 +1,94 @@
+import json
+import urllib.request
+
+from lifecycle_harness import start, stub_command, wait_for
+from query_stats import OTHER_STATEMENTS, QueryEventTail, QueryStats, normalize_statement
+
+
+def event_line(sql, ms):
+    return f"prisma:query-event {json.dumps({'query': sql, 'durationMs': ms})}\n"
+
+
+def test_normalize_statement_replaces_literals_and_collapses_lists():
+    sql = """SELECT "t1"."id" FROM "Task"  WHERE "id" IN ($1,$2, $3) AND "title" = 'it''s' LIMIT 20"""
+
+    assert normalize_statement(sql) == 'SELECT "t1"."id" FROM "Task" WHERE "id" IN (...) AND "title" = ? LIMIT ?'
+
+
+def test_aggregates_by_normalized_statement_and_ranks_by_total():
+    stats = QueryStats()
+    for ms in (1.0, 2.0, 3.0):
+        stats.parse_line(event_line('SELECT * FROM "Task" WHERE "id" IN ($1,$2)', ms))
+    stats.parse_line(event_line('SELECT * FROM "Task" WHERE "id" IN ($1,$2,$3,$4)', 4.0))
+    stats.parse_line(event_line('UPDATE "Task" SET "order" = $1', 20.0))
+
+    top = stats.top("total")
+
+    assert [row["statement"] for row in top] == ['UPDATE "Task" SET "order" = ?', 'SELECT * FROM "Task" WHERE "id" IN (...)']
+    assert top[1]["count"] == 4
+    assert top[1]["total_ms"] == 10.0
+    assert 3.9 <= top[1]["p99_ms"] <= 4.0
+    assert stats.top("count")[0]["count"] == 4
+
+
+def test_operations_count_rows():
+    stats = QueryStats()
+    for rows in (3, 5):
+        event = {"model": "Task", "operation": "findMany", "durationMs": 2.0, "rows": rows}
+        assert stats.parse_line(f"prisma:operation-event {json.dumps(event)}")
+
+    operation = stats.top_operations()[0]
+
+    assert operation["operation"] == "Task.findMany"
+    assert operation["rows"] == 8
+    assert operation["mean_rows"] == 4.0
+
+
+def test_distinct_statements_are_bounded():
+    stats = QueryStats(max_statements=2)
+    for table in ("A", "B", "C", "D"):
+        stats.record_statement(f'SELECT * FROM "{table}"', 1.0)
+
+    assert len(stats.statements) == 3
+    assert stats.statements[OTHER_STATEMENTS].count == 2
+
+
+def test_tail_reads_complete_lines_and_truncates_large_file(tmp_path):
+    path = tmp_path / "query_events.log"
+    path.write_text(event_line("SELECT 0", 1.0))
+    stats = QueryStats()
+    tail = QueryEventTail(str(path), stats, max_bytes=64)
+    tail.start()
+    tail.stop()
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(event_line("SELECT 1", 1.0) + event_line("SELECT 2", 2.0)[:10])
+    assert tail.read_new() == 1
+    assert path.stat().st_size == 0
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(event_line("SELECT 2", 2.0)[10:] + event_line("SELECT 3", 3.0))
+    assert tail.read_new() == 2
+
+    assert "SELECT ?" in stats.statements
+    assert stats.statements["SELECT ?"].count == 3
+
+
+def test_launcher_captures_queries_from_event_file(make_launcher, tmp_path):
+    instance = make_launcher(server_command=stub_command(emit_queries=True))
+    instance.query_stats_path = str(tmp_path / "query_stats.json")
+    instance.query_events_path = str(tmp_path / "query_events.log")
+    success, _ = start(instance)
+    assert success
+    instance.start_query_tail()
+
+    for _ in range(3):
+        with urllib.request.urlopen(f"http://127.0.0.1:{instance.port}/api/tasks?userId=u1", timeout=5) as response:
+            response.read()
+    assert wait_for(lambda: instance.query_stats.top_operations() and instance.query_stats.top_operations()[0]["count"] == 3)
+    instance.stop_server()
+
+    with open(instance.query_stats_path, encoding="utf-8") as f:
+        exported = json.load(f)
+    assert exported["statements"][0]["statement"].endswith('"userId" = ? OFFSET ?')
+    assert exported["statements"][0]["count"] == 3
+    assert exported["operations"][0]["rows"] == 9
@@ -0,0 +1,114 @@
+import json
+import urllib.request
+
+from launcher_settings import DEFAULT_SETTINGS
+from lifecycle_harness import free_port, start, stub_command
+from runtime_tuner import (RuntimeTuner, best_config, candidate_configs, choose_best, load_results,
+                           runtime_environment, save_results, summarize_runs, workload_paths)
+
+
+def result(name, rps, p99, rss=100, errors=0):
+    return {"config": {"name": name}, "requests": 100, "errors": errors,
+            "throughput_rps": rps, "p50_ms": p99 / 2, "p99_ms": p99, "peak_rss_mb": rss}
+
+
+def repeated(name, runs):
+    return summarize_runs({"name": name}, [dict(result(name, rps, p99), config=None) for rps, p99 in runs])
+
+
+def test_candidates_start_with_node_defaults():
+    configs = candidate_configs(DEFAULT_SETTINGS)
+
+    assert configs[0] == {"name": "default"}
+    assert len(configs) == 1 + 2 * 2 * 2
+    assert len({c["name"] for c in configs}) == len(configs)
+
+
+def test_runtime_environment_caps_heap_at_recycle_limit():
+    config = {"name": "big", "max_old_space_size_mb": 2048, "max_semi_space_size_mb": 32, "uv_threadpool_size": 8}
+
+    flags, env = runtime_environment(config, heap_limit=768)
+
+    assert flags == "--max-old-space-size=768 --max-semi-space-size=32"
+    assert env == {"UV_THREADPOOL_SIZE": "8"}
+    assert runtime_environment(None, heap_limit=768) == ("--max-old-space-size=768", {})
+    assert runtime_environment({"name": "default"}) == ("", {})
+
+
+def test_workload_skips_user_routes_without_user():
+    assert all("userId" not in path for path in workload_paths(None))
+    assert "/api/tasks?userId=me%40example.com" in workload_paths("me@example.com")
+
+
+def test_choose_best_prefers_tail_latency_among_fastest():
+    results = [
+        result("fast-slow-tail", 200, 80),
+        result("fast-good-tail", 195, 40),
+        result("slow", 120, 10),
+        result("broken", 300, 5, errors=3),
+    ]
+
+    assert choose_best(results)["config"]["name"] == "fast-good-tail"
+    assert choose_best([result("broken", 300, 5, errors=3)]) is None
+
+
+def test_summarize_runs_keeps_medians_and_spread():
+    summary = repeated("default", [(100, 40), (110, 60), (90, 50)])
+
+    assert summary["throughput_rps"] == 100
+    assert summary["p99_ms"] == 50
+    assert summary["throughput_spread_rps"] == 20
+    assert summary["p99_spread_ms"] == 20
+    assert summary["requests"] == 300
+
+
+def test_choose_best_keeps_default_within_noise():
+    default = repeated("default", [(100, 50), (104, 58), (98, 46)])
+    noisy = repeated("heap512-semi16-uv4", [(103, 45), (101, 52), (105, 49)])
+    better = repeated("heap768-semi64-uv8", [(102, 30), (100, 33), (104, 31)])
+    slower = repeated("heap512-semi64-uv4", [(80, 20), (79, 21), (81, 22)])
+
+    assert choose_best([default, noisy])["config"]["name"] == "default"
+    assert choose_best([default, noisy, better])["config"]["name"] == "heap768-semi64-uv8"
+    assert choose_best([default, slower])["config"]["name"] == "default"
+
+    failed_start = {"requests": 0, "errors": 0, "throughput_rps": 0.0, "p50_ms": None, "p99_ms": None,
+                    "peak_rss_mb": None, "failed": True}
+    flaky_default = summarize_runs({"name": "default"}, [result("default", 100, 50), failed_start])
+    assert flaky_default["failed"]
+    assert choose_best([flaky_default, noisy])["config"]["name"] == "heap512-semi16-uv4"
+
+
+def test_tuner_measures_each_config_and_launcher_applies_best(make_launcher, tmp_path):
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update({
+        "server_command": stub_command(),
+        "server_start_timeout_seconds": 10,
+        "tuning_port": free_port(),
+        "tuning_duration_seconds": 0.5,
+        "tuning_warmup_seconds": 0,
+        "tuning_concurrency": 2,
+        "tuning_repeats": 2,
+    })
+    configs = candidate_configs(settings)[:2]
+
+    report = RuntimeTuner(str(tmp_path), settings, log=lambda message: None).run(configs)
+    path = str(tmp_path / "runtime_tuning.json")
+    save_results(report, path)
+
+    assert [r["config"]["name"] for r in report["results"]] == ["default", configs[1]["name"]]
+    assert all(r["requests"] > 0 and r["peak_rss_mb"] > 0 for r in report["results"])
+    assert all(len(r["runs"]) == 2 and r["p99_spread_ms"] is not None for r in report["results"])
+    assert load_results(path)["best"] == report["best"]
+
+    report["best"] = configs[1]["name"]
+    save_results(report, path)
+    instance = make_launcher(recycle_rss_ceiling_mb=0)
+    instance.runtime_tuning_path = path
+    assert best_config(path) == configs[1]
+    success, _ = start(instance)
+    assert success
+    with urllib.request.urlopen(f"http://127.0.0.1:{instance.port}/api/health", timeout=5) as response:
+        health = json.loads(response.read().decode())
+    assert f"--max-semi-space-size={configs[1]['max_semi_space_size_mb']}" in health["nodeOptions"]
+    assert health["uvThreadpoolSize"] == str(configs[1]["uv_threadpool_size"])
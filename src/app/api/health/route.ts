@@ -1,5 +1,18 @@
 import { NextResponse } from "next/server";
+import { readFileSync } from "fs";
+import { join } from "path";
+
+// Build this server was started with, so the desktop launcher can tell whether it is still current
+function readBuildId() {
+  try {
+    return readFileSync(join(process.cwd(), ".next", "BUILD_ID"), "utf8").trim();
+  } catch {
+    return null;
+  }
+}
+
+const buildId = readBuildId();
 
 export async function GET() {
-  return NextResponse.json({ message: "Good!" });
-}
\ No newline at end of file
+  return NextResponse.json({ message: "Good!", buildId });
+}
@@ -1,13 +1,13 @@
 import { NextRequest, NextResponse } from 'next/server'
-import { writeFile, mkdir } from 'fs/promises'
+import { writeFile, mkdir, utimes, rename, unlink } from 'fs/promises'
 import { join } from 'path'
 import { existsSync } from 'fs'
+import { createHash, randomUUID } from 'crypto'
 
 export async function POST(request: NextRequest) {
   try {
     const data = await request.formData()
     const file: File | null = data.get('file') as unknown as File
-    const fileName = data.get('fileName') as string
 
     if (!file) {
       return NextResponse.json({ error: 'No file received' }, { status: 400 })
@@ -16,24 +16,40 @@ export async function POST(request: NextRequest) {
     const bytes = await file.arrayBuffer()
     const buffer = Buffer.from(bytes)
 
-    // Create assets directory if it doesn't exist
-    const assetsPath = join(process.cwd(), 'public', 'assets')
-    if (!existsSync(assetsPath)) {
-      await mkdir(assetsPath, { recursive: true })
-    }
+    // Content-addressed location: identical files are stored once
+    const digest = createHash('sha256').update(buffer).digest('hex')
+    const extension = file.name.includes('.') ? file.name.split('.').pop()!.toLowerCase() : ''
+    const storedFileName = /^[a-z0-9]{1,10}$/.test(extension) ? `${digest}.${extension}` : digest
+    const shard = digest.slice(0, 2)
 
-    // Generate unique filename
-    const fileExtension = file.name.split('.').pop()
-    const uniqueFileName = `${fileName || 'file'}_${Date.now()}.${fileExtension}`
-    const filePath = join(assetsPath, uniqueFileName)
+    // Create the shard directory if it doesn't exist
+    const shardPath = join(process.cwd(), 'public', 'assets', 'cas', shard)
+    if (!existsSync(shardPath)) {
+      await mkdir(shardPath, { recursive: true })
+    }
 
-    // Write the file
-    await writeFile(filePath, buffer)
+    const filePath = join(shardPath, storedFileName)
+    if (existsSync(filePath)) {
+      // Refresh the timestamp so the orphan sweep keeps it until the new row is saved
+      const now = new Date()
+      await utimes(filePath, now, now)
+    } else {
+      // Write next to the final name and rename it into place, so a crash mid-write
+      // never leaves a truncated file under the content hash
+      const tempPath = join(shardPath, `.${storedFileName}.${randomUUID()}.tmp`)
+      try {
+        await writeFile(tempPath, buffer)
+        await rename(tempPath, filePath)
+      } catch (error) {
+        await unlink(tempPath).catch(() => {})
+        throw error
+      }
+    }
 
-    return NextResponse.json({ 
+    return NextResponse.json({
       message: 'File uploaded successfully',
-      path: `/assets/${uniqueFileName}`,
-      fileName: uniqueFileName
+      path: `/assets/cas/${shard}/${storedFileName}`,
+      fileName: storedFileName
     })
 
   } catch (error) {
@@ -1,13 +1,65 @@
 import { PrismaClient } from '@prisma/client'
+import { createWriteStream, type WriteStream } from 'fs'
 
 const globalForPrisma = globalThis as unknown as {
   prisma: PrismaClient | undefined
 }
 
+// Rows returned by a Prisma operation: list length, affected count or a single record
+function countRows(result: unknown): number {
+  if (Array.isArray(result)) return result.length
+  if (typeof result === 'number') return result
+  if (result && typeof result === 'object') {
+    const count = (result as { count?: unknown }).count
+    return typeof count === 'number' ? count : 1
+  }
+  return 0
+}
+
+// Append-only event file; on any write error capture stops instead of affecting the server
+function openEventSink(path: string): (line: string) => void {
+  let stream: WriteStream | null = createWriteStream(path, { flags: 'a' })
+  stream.on('error', (error) => {
+    console.error('Query event capture disabled:', error.message)
+    stream = null
+  })
+  return (line) => {
+    stream?.write(`${line}\n`)
+  }
+}
+
+// With PRISMA_QUERY_EVENTS_FILE (set by the desktop launcher) every SQL statement and every Prisma
+// operation is appended to that file as one JSON line, which the launcher aggregates into its
+// top-queries view. A file keeps the server independent of whether the launcher is still running.
+function createQueryEventClient(path: string): PrismaClient {
+  const emit = openEventSink(path)
+  const client = new PrismaClient({
+    log: [{ emit: 'event', level: 'query' }],
+  })
+  client.$on('query', (e) => {
+    emit(`prisma:query-event ${JSON.stringify({ query: e.query, durationMs: e.duration })}`)
+  })
+  return client.$extends({
+    query: {
+      $allModels: {
+        async $allOperations({ model, operation, args, query }) {
+          const start = performance.now()
+          const result = await query(args)
+          const event = { model, operation, durationMs: performance.now() - start, rows: countRows(result) }
+          emit(`prisma:operation-event ${JSON.stringify(event)}`)
+          return result
+        },
+      },
+    },
+  }) as unknown as PrismaClient
+}
+
 export const db =
   globalForPrisma.prisma ??
-  new PrismaClient({
-    log: ['query'],
-  })
+  (process.env.PRISMA_QUERY_EVENTS_FILE
+    ? createQueryEventClient(process.env.PRISMA_QUERY_EVENTS_FILE)
+    : new PrismaClient({
+        log: ['query'],
+      }))
 
-if (process.env.NODE_ENV !== 'production') globalForPrisma.prisma = db
\ No newline at end of file
+if (process.env.NODE_ENV !== 'production') globalForPrisma.prisma = db
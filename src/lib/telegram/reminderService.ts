@@ -28,6 +28,11 @@ class TaskReminderService {
   }
 
   start() {
+    if (process.env.REMINDER_SCHEDULER === 'launcher') {
+      console.log('Task reminder cron disabled, reminders are scheduled by the desktop launcher');
+      return;
+    }
+
     if (this.job && !this.isRunning) {
       this.job.start();
       this.isRunning = true;